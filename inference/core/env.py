@@ -240,6 +240,17 @@ MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "/tmp/cache")
 # Model ID, default is None
 MODEL_ID = os.getenv("MODEL_ID")
 
+# Flag to serve last known Roboflow API responses when the API cannot be reached, default is True
+ROBOFLOW_CACHE_FALLBACK = str2bool(os.getenv("ROBOFLOW_CACHE_FALLBACK", True))
+
+# Expiry time of last known Roboflow API responses kept for fallback, default is 86400 (24h)
+ROBOFLOW_CACHE_FALLBACK_EXPIRE = int(os.getenv("ROBOFLOW_CACHE_FALLBACK_EXPIRE", 86400))
+
+# Expiry time of Roboflow model data persisted on disk (under MODEL_CACHE_DIR/api_data) to speed up cold starts, default is 0 (disabled)
+ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE = int(
+    os.getenv("ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 0)
+)
+
 # Enable jupyter notebook server route, default is False
 NOTEBOOK_ENABLED = str2bool(os.getenv("NOTEBOOK_ENABLED", False))
 
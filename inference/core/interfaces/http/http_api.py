@@ -156,7 +156,7 @@ from inference.core.workflows.execution_engine.compiler.syntactic_parser import
 )
 from inference.core.workflows.execution_engine.core import ExecutionEngine
 from inference.models.aliases import resolve_roboflow_model_alias
-from inference.usage_tracking.collector import usage_collector
+from inference.usage_tracking.collector import get_usage_collector
 
 if LAMBDA:
     from inference.core.usage import trackUsage
@@ -344,7 +344,7 @@ class LambdaMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
         response = await call_next(request)
         logger.info("Lambda is terminating, handle unsent usage payloads.")
-        await usage_collector.async_push_usage_payloads()
+        await get_usage_collector().async_push_usage_payloads()
         return response
 
 
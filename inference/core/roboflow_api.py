@@ -1,12 +1,25 @@
+import asyncio
+import hashlib
+import inspect
 import json
+import math
 import os
+import random
+import threading
+import time
 import urllib.parse
+import weakref
+from collections import OrderedDict
 from enum import Enum
+from functools import lru_cache, wraps
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
+import aiohttp
+import numpy as np
 import requests
 from requests import Response
-from requests_toolbelt import MultipartEncoder
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from inference.core import logger
 from inference.core.cache import cache
@@ -17,7 +30,13 @@ from inference.core.entities.types import (
     VersionID,
     WorkspaceID,
 )
-from inference.core.env import API_BASE_URL, MODEL_CACHE_DIR
+from inference.core.env import (
+    API_BASE_URL,
+    MODEL_CACHE_DIR,
+    ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE,
+    ROBOFLOW_CACHE_FALLBACK,
+    ROBOFLOW_CACHE_FALLBACK_EXPIRE,
+)
 from inference.core.exceptions import (
     MalformedRoboflowAPIResponseError,
     MalformedWorkflowResponseError,
@@ -32,9 +51,15 @@ from inference.core.exceptions import (
     WorkspaceLoadError,
 )
 from inference.core.utils.file_system import sanitize_path_segment
+from inference.core.utils.image_utils import encode_image_to_jpeg_bytes
 from inference.core.utils.requests import api_key_safe_raise_for_status
 from inference.core.utils.url_utils import wrap_url
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 MODEL_TYPE_DEFAULTS = {
     "object-detection": "yolov5v2s",
     "instance-segmentation": "yolact",
@@ -44,6 +69,15 @@ MODEL_TYPE_DEFAULTS = {
 PROJECT_TASK_TYPE_KEY = "project_task_type"
 MODEL_TYPE_KEY = "model_type"
 
+# cache expiry (in seconds) of Roboflow API responses, aligned with how often given data changes
+CACHE_POLICY = {
+    "model_data": 20,
+    "lora_base": 60,
+    "dataset_type": 300,
+    "model_type": 300,
+    "active_learning": 60,
+}
+
 NOT_FOUND_ERROR_MESSAGE = (
     "Could not find requested Roboflow resource. Check that the provided dataset and "
     "version are correct, and check that the provided Roboflow API key has the correct permissions."
@@ -69,35 +103,142 @@ DEFAULT_ERROR_HANDLERS = {
 }
 
 
+def _create_session() -> requests.Session:
+    # shared session gives HTTP keep-alive and connection pooling across calls;
+    # retries are only applied to idempotent methods (urllib3 default)
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _create_session()
+
+# keys already looked up in this process - disk cache is only read on first lookup
+API_DATA_LOOKUPS_LIMIT = 4096
+_API_DATA_LOOKUPS = OrderedDict()
+_API_DATA_LOOKUPS_LOCK = threading.Lock()
+
+# aiohttp sessions are bound to the event loop they were created in
+_ASYNC_SESSIONS = weakref.WeakKeyDictionary()
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _ASYNC_SESSIONS.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=16, keepalive_timeout=60
+            )
+        )
+        _ASYNC_SESSIONS[loop] = session
+    return session
+
+
+async def close_async_session() -> None:
+    # shared session of running loop is to be closed before the loop is, not to leak
+    # its connections
+    session = _ASYNC_SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+ROBOFLOW_API_ERRORS = (
+    aiohttp.ClientConnectionError,
+    requests.exceptions.ConnectionError,
+    ConnectionError,
+    requests.exceptions.HTTPError,
+    requests.exceptions.InvalidJSONError,
+)
+
+
 def wrap_roboflow_api_errors(
     http_errors_handlers: Optional[
         Dict[int, Callable[[Union[requests.exceptions.HTTPError]], None]]
     ] = None,
 ) -> callable:
+    error_handlers = {**DEFAULT_ERROR_HANDLERS, **(http_errors_handlers or {})}
+
     def decorator(function: callable) -> callable:
+        @wraps(function)
         def wrapper(*args, **kwargs) -> Any:
             try:
                 return function(*args, **kwargs)
-            except (requests.exceptions.ConnectionError, ConnectionError) as error:
-                raise RoboflowAPIConnectionError(
-                    "Could not connect to Roboflow API."
-                ) from error
-            except requests.exceptions.HTTPError as error:
-                user_handler_override = (
-                    http_errors_handlers if http_errors_handlers is not None else {}
-                )
-                status_code = error.response.status_code
-                default_handler = DEFAULT_ERROR_HANDLERS.get(status_code)
-                error_handler = user_handler_override.get(status_code, default_handler)
-                if error_handler is not None:
-                    error_handler(error)
-                raise RoboflowAPIUnsuccessfulRequestError(
-                    f"Unsuccessful request to Roboflow API with response code: {status_code}"
-                ) from error
-            except requests.exceptions.InvalidJSONError as error:
-                raise MalformedRoboflowAPIResponseError(
-                    "Could not decode JSON response from Roboflow API."
-                ) from error
+            except ROBOFLOW_API_ERRORS as error:
+                _raise_roboflow_api_error(error=error, error_handlers=error_handlers)
+
+        @wraps(function)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            try:
+                return await function(*args, **kwargs)
+            except ROBOFLOW_API_ERRORS as error:
+                _raise_roboflow_api_error(error=error, error_handlers=error_handlers)
+
+        if asyncio.iscoroutinefunction(function):
+            return async_wrapper
+        return wrapper
+
+    return decorator
+
+
+def _raise_roboflow_api_error(
+    error: Exception,
+    error_handlers: Dict[int, Callable[[requests.exceptions.HTTPError], None]],
+) -> None:
+    if isinstance(error, requests.exceptions.HTTPError):
+        status_code = error.response.status_code
+        error_handler = error_handlers.get(status_code)
+        if error_handler is not None:
+            error_handler(error)
+        raise RoboflowAPIUnsuccessfulRequestError(
+            f"Unsuccessful request to Roboflow API with response code: {status_code}"
+        ) from error
+    if isinstance(error, requests.exceptions.InvalidJSONError):
+        raise MalformedRoboflowAPIResponseError(
+            "Could not decode JSON response from Roboflow API."
+        ) from error
+    raise RoboflowAPIConnectionError("Could not connect to Roboflow API.") from error
+
+
+def cached(policy: str) -> callable:
+    ttl = CACHE_POLICY[policy]
+
+    def decorator(function: callable) -> callable:
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs) -> Any:
+            bound_arguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+            # arguments are hashed not to expose API keys in cache keys
+            arguments_hash = hashlib.sha256(
+                json.dumps(bound_arguments.arguments, sort_keys=True).encode()
+            ).hexdigest()
+            cache_key = f"roboflow_api_data:{policy}:{arguments_hash}"
+            result = _get_api_data_from_cache(cache_key=cache_key)
+            if result is not None:
+                logger.debug(f"Loaded {policy} from cache with key: {cache_key}.")
+                return result
+            fetch_start = time.time()
+            result = function(*args, **kwargs)
+            _set_api_data_in_cache(
+                cache_key=cache_key,
+                api_data=result,
+                ttl=ttl,
+                fetch_duration=time.time() - fetch_start,
+            )
+            return result
 
         return wrapper
 
@@ -129,7 +270,7 @@ def add_custom_metadata(
         url=f"{API_BASE_URL}/{workspace_id}/inference-stats/metadata",
         params=[("api_key", api_key), ("nocache", "true")],
     )
-    response = requests.post(
+    response = _SESSION.post(
         url=api_url,
         json={
             "data": [
@@ -146,6 +287,7 @@ def add_custom_metadata(
 
 
 @wrap_roboflow_api_errors()
+@cached(policy="dataset_type")
 def get_roboflow_dataset_type(
     api_key: str, workspace_id: WorkspaceID, dataset_id: DatasetID
 ) -> TaskType:
@@ -172,6 +314,7 @@ def get_roboflow_dataset_type(
         # TO BE FIXED at backend, otherwise this error handling may overshadow existing backend problems.
     }
 )
+@cached(policy="model_type")
 def get_roboflow_model_type(
     api_key: str,
     workspace_id: WorkspaceID,
@@ -209,32 +352,62 @@ def get_roboflow_model_data(
     device_id: str,
 ) -> dict:
     api_data_cache_key = f"roboflow_api_data:{endpoint_type.value}:{model_id}"
-    api_data = cache.get(api_data_cache_key)
+    api_data = _get_api_data_from_cache(cache_key=api_data_cache_key)
     if api_data is not None:
         logger.debug(f"Loaded model data from cache with key: {api_data_cache_key}.")
         return api_data
-    else:
-        params = [
-            ("nocache", "true"),
-            ("device", device_id),
-            ("dynamic", "true"),
-        ]
-        if api_key is not None:
-            params.append(("api_key", api_key))
-        api_url = _add_params_to_url(
-            url=f"{API_BASE_URL}/{endpoint_type.value}/{model_id}",
-            params=params,
-        )
-        api_data = _get_from_url(url=api_url)
-        cache.set(
-            api_data_cache_key,
-            api_data,
-            expire=10,
+    api_key_scoped_cache_key = _get_api_key_scoped_cache_key(
+        cache_key=api_data_cache_key, api_key=api_key
+    )
+    if _is_first_api_data_lookup(cache_key=api_key_scoped_cache_key):
+        # disk cache only speeds up cold starts, afterwards memory cache policy rules
+        api_data = _get_api_data_from_disk_cache(cache_key=api_key_scoped_cache_key)
+        if api_data is not None:
+            logger.debug(
+                f"Loaded model data from disk cache with key: {api_data_cache_key}."
+            )
+            _set_api_data_in_cache(
+                cache_key=api_data_cache_key,
+                api_data=api_data,
+                ttl=CACHE_POLICY["model_data"],
+                fetch_duration=0.0,
+            )
+            return api_data
+    params = [
+        ("nocache", "true"),
+        ("device", device_id),
+        ("dynamic", "true"),
+    ]
+    if api_key is not None:
+        params.append(("api_key", api_key))
+    api_url = _add_params_to_url(
+        url=f"{API_BASE_URL}/{endpoint_type.value}/{model_id}",
+        params=params,
+    )
+    fetch_start = time.time()
+    try:
+        api_data = _get_from_url_with_cache_fallback(
+            url=api_url, cache_key=api_key_scoped_cache_key
         )
-        logger.debug(
-            f"Loaded model data from Roboflow API and saved to cache with key: {api_data_cache_key}."
+    except (requests.exceptions.ConnectionError, ConnectionError) as error:
+        api_data = _get_api_data_from_disk_cache(cache_key=api_key_scoped_cache_key)
+        if api_data is None:
+            raise error
+        logger.warning(
+            f"Could not connect to Roboflow API - using model data from disk cache with key: {api_data_cache_key}."
         )
         return api_data
+    _set_api_data_in_cache(
+        cache_key=api_data_cache_key,
+        api_data=api_data,
+        ttl=CACHE_POLICY["model_data"],
+        fetch_duration=time.time() - fetch_start,
+    )
+    _set_api_data_in_disk_cache(cache_key=api_key_scoped_cache_key, api_data=api_data)
+    logger.debug(
+        f"Loaded model data from Roboflow API and saved to cache with key: {api_data_cache_key}."
+    )
+    return api_data
 
 
 @wrap_roboflow_api_errors()
@@ -243,7 +416,7 @@ def get_roboflow_base_lora(
 ) -> dict:
     full_path = os.path.join(repo, revision)
     api_data_cache_key = f"roboflow_api_data:lora-bases:{full_path}"
-    api_data = cache.get(api_data_cache_key)
+    api_data = _get_api_data_from_cache(cache_key=api_data_cache_key)
     if api_data is not None:
         logger.debug(f"Loaded model data from cache with key: {api_data_cache_key}.")
         return api_data
@@ -259,11 +432,18 @@ def get_roboflow_base_lora(
             url=f"{API_BASE_URL}/lora_bases",
             params=params,
         )
-        api_data = _get_from_url(url=api_url)
-        cache.set(
-            api_data_cache_key,
-            api_data,
-            expire=10,
+        fetch_start = time.time()
+        api_data = _get_from_url_with_cache_fallback(
+            url=api_url,
+            cache_key=_get_api_key_scoped_cache_key(
+                cache_key=api_data_cache_key, api_key=api_key
+            ),
+        )
+        _set_api_data_in_cache(
+            cache_key=api_data_cache_key,
+            api_data=api_data,
+            ttl=CACHE_POLICY["lora_base"],
+            fetch_duration=time.time() - fetch_start,
         )
         logger.debug(
             f"Loaded lora base model data from Roboflow API and saved to cache with key: {api_data_cache_key}."
@@ -271,7 +451,94 @@ def get_roboflow_base_lora(
         return api_data
 
 
+def _get_api_data_from_cache(cache_key: str) -> Optional[Any]:
+    cached_entry = cache.get(cache_key)
+    if not isinstance(cached_entry, dict) or "api_data" not in cached_entry:
+        return None
+    if _should_expire_early(
+        fetch_duration=cached_entry["fetch_duration"],
+        expires_at=cached_entry["expires_at"],
+    ):
+        return None
+    return cached_entry["api_data"]
+
+
+def _set_api_data_in_cache(
+    cache_key: str, api_data: Any, ttl: float, fetch_duration: float
+) -> None:
+    ttl = _jittered_ttl(base=ttl)
+    cached_entry = {
+        "api_data": api_data,
+        "fetch_duration": fetch_duration,
+        "expires_at": time.time() + ttl,
+    }
+    cache.set(cache_key, cached_entry, expire=ttl)
+
+
+def _is_first_api_data_lookup(cache_key: str) -> bool:
+    # lookups come from request threads, eviction must not interleave with check
+    with _API_DATA_LOOKUPS_LOCK:
+        if cache_key in _API_DATA_LOOKUPS:
+            _API_DATA_LOOKUPS.move_to_end(cache_key)
+            return False
+        _API_DATA_LOOKUPS[cache_key] = True
+        if len(_API_DATA_LOOKUPS) > API_DATA_LOOKUPS_LIMIT:
+            _API_DATA_LOOKUPS.popitem(last=False)
+        return True
+
+
+def _get_api_data_disk_cache_file(cache_key: str) -> str:
+    return os.path.join(
+        MODEL_CACHE_DIR, "api_data", f"{sanitize_path_segment(cache_key)}.json"
+    )
+
+
+def _get_api_data_from_disk_cache(cache_key: str) -> Optional[Any]:
+    if ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE <= 0:
+        return None
+    cache_file = _get_api_data_disk_cache_file(cache_key=cache_key)
+    try:
+        if (
+            os.path.getmtime(cache_file) + ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE
+            < time.time()
+        ):
+            return None
+        with open(cache_file, "rb") as f:
+            return _load_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _set_api_data_in_disk_cache(cache_key: str, api_data: Any) -> None:
+    if ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE <= 0:
+        return None
+    cache_file = _get_api_data_disk_cache_file(cache_key=cache_key)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "wb") as f:
+            f.write(_dump_json(api_data))
+    except OSError as error:
+        logger.warning(f"Could not save model data to disk cache: {error}")
+
+
+def _jittered_ttl(base: float, jitter: float = 0.2) -> int:
+    # spreading expiry times prevents all workers from refreshing the same key at once
+    return max(1, round(base + random.uniform(-jitter, jitter) * base))
+
+
+def _should_expire_early(
+    fetch_duration: float, expires_at: float, beta: float = 1.0
+) -> bool:
+    # probabilistic early expiration (XFetch) - the closer to expiry and the more
+    # expensive the fetch, the more likely a single caller refreshes ahead of time
+    return (
+        time.time() - fetch_duration * beta * math.log(1.0 - random.random())
+        >= expires_at
+    )
+
+
 @wrap_roboflow_api_errors()
+@cached(policy="active_learning")
 def get_roboflow_active_learning_configuration(
     api_key: str,
     workspace_id: WorkspaceID,
@@ -281,7 +548,13 @@ def get_roboflow_active_learning_configuration(
         url=f"{API_BASE_URL}/{workspace_id}/{dataset_id}/active_learning",
         params=[("api_key", api_key)],
     )
-    return _get_from_url(url=api_url)
+    return _get_from_url_with_cache_fallback(
+        url=api_url,
+        cache_key=_get_api_key_scoped_cache_key(
+            cache_key=f"roboflow_api_data:active_learning:{workspace_id}:{dataset_id}",
+            api_key=api_key,
+        ),
+    )
 
 
 @wrap_roboflow_api_errors()
@@ -289,40 +562,28 @@ def register_image_at_roboflow(
     api_key: str,
     dataset_id: DatasetID,
     local_image_id: str,
-    image_bytes: bytes,
+    image_bytes: Union[bytes, np.ndarray],
     batch_name: str,
     tags: Optional[List[str]] = None,
     inference_id: Optional[str] = None,
+    jpeg_quality: int = 85,
 ) -> dict:
-    url = f"{API_BASE_URL}/dataset/{dataset_id}/upload"
-    params = [
-        ("api_key", api_key),
-        ("batch", batch_name),
-    ]
-    if inference_id is not None:
-        params.append(("inference_id", inference_id))
-    tags = tags if tags is not None else []
-    for tag in tags:
-        params.append(("tag", tag))
-    wrapped_url = wrap_url(_add_params_to_url(url=url, params=params))
-    m = MultipartEncoder(
-        fields={
-            "name": f"{local_image_id}.jpg",
-            "file": ("imageToUpload", image_bytes, "image/jpeg"),
-        }
+    wrapped_url, image_bytes = _prepare_image_registration_request(
+        api_key=api_key,
+        dataset_id=dataset_id,
+        image_bytes=image_bytes,
+        batch_name=batch_name,
+        tags=tags,
+        inference_id=inference_id,
+        jpeg_quality=jpeg_quality,
     )
-    response = requests.post(
+    response = _SESSION.post(
         url=wrapped_url,
-        data=m,
-        headers={"Content-Type": m.content_type},
+        data={"name": f"{local_image_id}.jpg"},
+        files={"file": ("imageToUpload", image_bytes, "image/jpeg")},
     )
     api_key_safe_raise_for_status(response=response)
-    parsed_response = response.json()
-    if not parsed_response.get("duplicate") and not parsed_response.get("success"):
-        raise RoboflowAPIImageUploadRejectionError(
-            f"Server rejected image: {parsed_response}"
-        )
-    return parsed_response
+    return _verify_image_registration_response(parsed_response=response.json())
 
 
 @wrap_roboflow_api_errors(
@@ -343,20 +604,157 @@ def annotate_image_at_roboflow(
     annotation_file_type: str,
     is_prediction: bool = True,
 ) -> dict:
+    wrapped_url = _prepare_image_annotation_url(
+        api_key=api_key,
+        dataset_id=dataset_id,
+        local_image_id=local_image_id,
+        roboflow_image_id=roboflow_image_id,
+        annotation_file_type=annotation_file_type,
+        is_prediction=is_prediction,
+    )
+    response = _SESSION.post(
+        wrapped_url,
+        data=annotation_content,
+        headers={"Content-Type": "text/plain"},
+    )
+    api_key_safe_raise_for_status(response=response)
+    return _verify_image_annotation_response(
+        parsed_response=response.json(), roboflow_image_id=roboflow_image_id
+    )
+
+
+@wrap_roboflow_api_errors()
+async def async_register_image_at_roboflow(
+    api_key: str,
+    dataset_id: DatasetID,
+    local_image_id: str,
+    image_bytes: Union[bytes, np.ndarray],
+    batch_name: str,
+    tags: Optional[List[str]] = None,
+    inference_id: Optional[str] = None,
+    jpeg_quality: int = 85,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    if session is None:
+        session = get_async_session()
+    wrapped_url, image_bytes = _prepare_image_registration_request(
+        api_key=api_key,
+        dataset_id=dataset_id,
+        image_bytes=image_bytes,
+        batch_name=batch_name,
+        tags=tags,
+        inference_id=inference_id,
+        jpeg_quality=jpeg_quality,
+    )
+    form_data = aiohttp.FormData()
+    form_data.add_field("name", f"{local_image_id}.jpg")
+    form_data.add_field(
+        "file", image_bytes, filename="imageToUpload", content_type="image/jpeg"
+    )
+    async with session.post(wrapped_url, data=form_data) as response:
+        await _async_raise_for_status(response=response)
+        parsed_response = await _async_parse_json(response=response)
+    return _verify_image_registration_response(parsed_response=parsed_response)
+
+
+@wrap_roboflow_api_errors(
+    http_errors_handlers={
+        409: lambda e: raise_from_lambda(
+            e,
+            RoboflowAPIIAlreadyAnnotatedError,
+            "Given datapoint already has annotation.",
+        )
+    }
+)
+async def async_annotate_image_at_roboflow(
+    api_key: str,
+    dataset_id: DatasetID,
+    local_image_id: str,
+    roboflow_image_id: str,
+    annotation_content: str,
+    annotation_file_type: str,
+    is_prediction: bool = True,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    if session is None:
+        session = get_async_session()
+    wrapped_url = _prepare_image_annotation_url(
+        api_key=api_key,
+        dataset_id=dataset_id,
+        local_image_id=local_image_id,
+        roboflow_image_id=roboflow_image_id,
+        annotation_file_type=annotation_file_type,
+        is_prediction=is_prediction,
+    )
+    async with session.post(
+        wrapped_url,
+        data=annotation_content,
+        headers={"Content-Type": "text/plain"},
+    ) as response:
+        await _async_raise_for_status(response=response)
+        parsed_response = await _async_parse_json(response=response)
+    return _verify_image_annotation_response(
+        parsed_response=parsed_response, roboflow_image_id=roboflow_image_id
+    )
+
+
+def _prepare_image_registration_request(
+    api_key: str,
+    dataset_id: DatasetID,
+    image_bytes: Union[bytes, np.ndarray],
+    batch_name: str,
+    tags: Optional[List[str]],
+    inference_id: Optional[str],
+    jpeg_quality: int,
+) -> Tuple[str, bytes]:
+    # `jpeg_quality` only applies when raw (BGR) image is given - 85 yields noticeably
+    # smaller payloads than OpenCV default (95) at barely visible quality cost.
+    # Pre-encoded bytes are sent as they are.
+    if isinstance(image_bytes, np.ndarray):
+        image_bytes = encode_image_to_jpeg_bytes(
+            image=image_bytes, jpeg_quality=jpeg_quality
+        )
+    url = f"{API_BASE_URL}/dataset/{dataset_id}/upload"
+    params = [
+        ("api_key", api_key),
+        ("batch", batch_name),
+    ]
+    if inference_id is not None:
+        params.append(("inference_id", inference_id))
+    tags = tags if tags is not None else []
+    for tag in tags:
+        params.append(("tag", tag))
+    return wrap_url(_add_params_to_url(url=url, params=params)), image_bytes
+
+
+def _verify_image_registration_response(parsed_response: dict) -> dict:
+    if not parsed_response.get("duplicate") and not parsed_response.get("success"):
+        raise RoboflowAPIImageUploadRejectionError(
+            f"Server rejected image: {parsed_response}"
+        )
+    return parsed_response
+
+
+def _prepare_image_annotation_url(
+    api_key: str,
+    dataset_id: DatasetID,
+    local_image_id: str,
+    roboflow_image_id: str,
+    annotation_file_type: str,
+    is_prediction: bool,
+) -> str:
     url = f"{API_BASE_URL}/dataset/{dataset_id}/annotate/{roboflow_image_id}"
     params = [
         ("api_key", api_key),
         ("name", f"{local_image_id}.{annotation_file_type}"),
         ("prediction", str(is_prediction).lower()),
     ]
-    wrapped_url = wrap_url(_add_params_to_url(url=url, params=params))
-    response = requests.post(
-        wrapped_url,
-        data=annotation_content,
-        headers={"Content-Type": "text/plain"},
-    )
-    api_key_safe_raise_for_status(response=response)
-    parsed_response = response.json()
+    return wrap_url(_add_params_to_url(url=url, params=params))
+
+
+def _verify_image_annotation_response(
+    parsed_response: dict, roboflow_image_id: str
+) -> dict:
     if "error" in parsed_response or not parsed_response.get("success"):
         raise RoboflowAPIIAnnotationRejectionError(
             f"Failed to save annotation for {roboflow_image_id}. API response: {parsed_response}"
@@ -386,6 +784,19 @@ def get_roboflow_labeling_jobs(
     return _get_from_url(url=api_url)
 
 
+def _dump_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _load_json(value: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+@lru_cache(maxsize=1024)
 def get_workflow_cache_file(workspace_id: WorkspaceID, workflow_id: str):
     sanitized_workspace_id = sanitize_path_segment(workspace_id)
     sanitized_workflow_id = sanitize_path_segment(workflow_id)
@@ -402,10 +813,9 @@ def cache_workflow_response(
 ):
     workflow_cache_file = get_workflow_cache_file(workspace_id, workflow_id)
     workflow_cache_dir = os.path.dirname(workflow_cache_file)
-    if not os.path.exists(workflow_cache_dir):
-        os.makedirs(workflow_cache_dir, exist_ok=True)
-    with open(workflow_cache_file, "w") as f:
-        json.dump(response, f)
+    os.makedirs(workflow_cache_dir, exist_ok=True)
+    with open(workflow_cache_file, "wb") as f:
+        f.write(_dump_json(response))
 
 
 def delete_cached_workflow_response_if_exists(
@@ -421,8 +831,8 @@ def load_cached_workflow_response(workspace_id: WorkspaceID, workflow_id: str) -
     if not os.path.exists(workflow_cache_file):
         return None
     try:
-        with open(workflow_cache_file, "r") as f:
-            return json.load(f)
+        with open(workflow_cache_file, "rb") as f:
+            return _load_json(f.read())
     except:
         delete_cached_workflow_response_if_exists(workspace_id, workflow_id)
 
@@ -449,7 +859,7 @@ def get_workflow_specification(
             f"Could not find workflow specification in API response"
         )
     try:
-        workflow_config = json.loads(response["workflow"]["config"])
+        workflow_config = _load_json(response["workflow"]["config"])
         return workflow_config["specification"]
     except KeyError as error:
         raise MalformedWorkflowResponseError(
@@ -469,19 +879,65 @@ def get_from_url(
     return _get_from_url(url=url, json_response=json_response)
 
 
+def _get_api_key_scoped_cache_key(cache_key: str, api_key: Optional[str]) -> str:
+    # responses served without reaching the API must only go back to the same API key,
+    # which is hashed not to expose it in cache keys
+    api_key_hash = hashlib.sha256(str(api_key).encode()).hexdigest()
+    return f"{cache_key}:{api_key_hash}"
+
+
+def _get_from_url_with_cache_fallback(url: str, cache_key: str) -> dict:
+    fallback_cache_key = f"{cache_key}:stale"
+    try:
+        api_data = _get_from_url(url=url)
+    except (requests.exceptions.ConnectionError, ConnectionError) as error:
+        if not ROBOFLOW_CACHE_FALLBACK:
+            raise error
+        api_data = cache.get(fallback_cache_key)
+        if api_data is None:
+            raise error
+        logger.warning(
+            f"Could not connect to Roboflow API - using last known response cached under key: {fallback_cache_key}."
+        )
+        return api_data
+    if ROBOFLOW_CACHE_FALLBACK:
+        cache.set(fallback_cache_key, api_data, expire=ROBOFLOW_CACHE_FALLBACK_EXPIRE)
+    return api_data
+
+
 def _get_from_url(url: str, json_response: bool = True) -> Union[Response, dict]:
-    response = requests.get(wrap_url(url))
+    response = _SESSION.get(wrap_url(url))
     api_key_safe_raise_for_status(response=response)
     if json_response:
         return response.json()
     return response
 
 
+async def _async_raise_for_status(response: aiohttp.ClientResponse) -> None:
+    if response.status < 400:
+        return None
+    # translated into requests response, so that error handling is shared with sync API
+    requests_response = Response()
+    requests_response.status_code = response.status
+    requests_response.reason = response.reason
+    requests_response.url = str(response.url)
+    requests_response._content = await response.read()
+    api_key_safe_raise_for_status(response=requests_response)
+
+
+async def _async_parse_json(response: aiohttp.ClientResponse) -> dict:
+    try:
+        return _load_json(await response.read())
+    except ValueError as error:
+        raise requests.exceptions.InvalidJSONError(
+            "Could not decode JSON response"
+        ) from error
+
+
 def _add_params_to_url(url: str, params: List[Tuple[str, str]]) -> str:
     if len(params) == 0:
         return url
-    params_chunks = [
-        f"{name}={urllib.parse.quote_plus(value)}" for name, value in params
-    ]
-    parameters_string = "&".join(params_chunks)
+    parameters_string = urllib.parse.urlencode(
+        params, quote_via=urllib.parse.quote_plus
+    )
     return f"{url}?{parameters_string}"
@@ -1,5 +1,8 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Literal, Optional, Type, Union
-from uuid import uuid4
+from uuid import UUID
 
 import cv2
 import numpy as np
@@ -41,6 +44,20 @@ need to detect a QR code region in an image. You can then apply Crop block to is
 each QR code then apply further processing (i.e. read a QR code with a custom block).
 """
 
+# OpenCV releases the GIL while detecting, so batch elements are processed in parallel
+QR_DETECTION_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
+_EMPTY_XYXY = np.empty((0, 4), dtype=np.float32)
+_EMPTY_CONFIDENCE = np.empty(0)
+_EMPTY_CLASS_ID = np.empty(0, dtype=int)
+_EMPTY_DATA = {
+    CLASS_NAME_DATA_FIELD: np.empty(0, dtype=str),
+    DETECTION_ID_KEY: np.empty(0, dtype=object),
+    PREDICTION_TYPE_KEY: np.empty(0, dtype=str),
+    DETECTED_CODE_KEY: np.empty(0, dtype=str),
+    IMAGE_DIMENSIONS_KEY: np.empty((0, 2), dtype=int),
+}
+
 
 class BlockManifest(WorkflowBlockManifest):
     model_config = ConfigDict(
@@ -70,6 +87,10 @@ class BlockManifest(WorkflowBlockManifest):
 
 class QRCodeDetectorBlock(WorkflowBlock):
 
+    def __init__(self):
+        # detectors are kept per thread, as they are not guaranteed to be thread-safe
+        self._detectors = threading.local()
+
     @classmethod
     def get_manifest(cls) -> Type[WorkflowBlockManifest]:
         return BlockManifest
@@ -78,48 +99,46 @@ class QRCodeDetectorBlock(WorkflowBlock):
         self,
         images: Batch[WorkflowImageData],
     ) -> BlockResult:
-        results = []
-        for image in images:
-            qr_code_detections = detect_qr_codes(image=image)
-            results.append({"predictions": qr_code_detections})
-        return results
+        return list(QR_DETECTION_POOL.map(self._detect_qr_codes, images))
 
+    def _detect_qr_codes(self, image: WorkflowImageData) -> Dict[str, sv.Detections]:
+        detector = getattr(self._detectors, "detector", None)
+        if detector is None:
+            detector = cv2.QRCodeDetector()
+            self._detectors.detector = detector
+        return {"predictions": detect_qr_codes(image=image, detector=detector)}
 
-def detect_qr_codes(image: WorkflowImageData) -> sv.Detections:
-    detector = cv2.QRCodeDetector()
-    retval, detections, points_list, _ = detector.detectAndDecodeMulti(
+
+def detect_qr_codes(
+    image: WorkflowImageData,
+    detector: Optional[cv2.QRCodeDetector] = None,
+) -> sv.Detections:
+    if detector is None:
+        detector = cv2.QRCodeDetector()
+    retval, detections_data, points_list, _ = detector.detectAndDecodeMulti(
         image.numpy_image
     )
-    xyxy = []
-    confidence = []
-    class_id = []
-    class_name = []
-    extracted_data = []
-    for data, points in zip(detections, points_list):
-        width = points[2][0] - points[0][0]
-        height = points[2][1] - points[0][1]
-        x_min = points[0][0]
-        y_min = points[0][1]
-        x_max = x_min + width
-        y_max = y_min + height
-        xyxy.append([x_min, y_min, x_max, y_max])
-        class_id.append(0)
-        class_name.append("qr_code")
-        confidence.append(1.0)
-        extracted_data.append(data)
-    xyxy = np.array(xyxy) if len(xyxy) > 0 else np.empty((0, 4))
-    confidence = np.array(confidence) if len(confidence) > 0 else np.empty(0)
-    class_id = np.array(class_id).astype(int) if len(class_id) > 0 else np.empty(0)
-    class_name = np.array(class_name) if len(class_name) > 0 else np.empty(0)
+    if points_list is None or len(points_list) == 0:
+        # most video frames contain no codes - skip ids generation and data building
+        return attach_parents_coordinates_to_sv_detections(
+            detections=_empty_qr_detections(),
+            image=image,
+        )
+    points = np.asarray(points_list, dtype=np.float32).reshape(-1, 4, 2)
+    detections_number = len(points)
+    # min / max over corners also gives correct boxes for rotated codes
+    xyxy = np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1)
     detections = sv.Detections(
-        xyxy=np.array(xyxy),
-        confidence=confidence,
-        class_id=class_id,
-        data={CLASS_NAME_DATA_FIELD: class_name},
+        xyxy=xyxy,
+        confidence=np.ones(detections_number),
+        class_id=np.zeros(detections_number, dtype=int),
+        data={CLASS_NAME_DATA_FIELD: np.full(detections_number, "qr_code")},
+    )
+    detections[DETECTION_ID_KEY] = generate_detection_ids(
+        detections_number=detections_number
     )
-    detections[DETECTION_ID_KEY] = np.array([uuid4() for _ in range(len(detections))])
     detections[PREDICTION_TYPE_KEY] = np.array(["qrcode-detection"] * len(detections))
-    detections[DETECTED_CODE_KEY] = np.array(extracted_data)
+    detections[DETECTED_CODE_KEY] = np.array(detections_data[:detections_number])
     img_height, img_width = image.numpy_image.shape[:2]
     detections[IMAGE_DIMENSIONS_KEY] = np.array(
         [[img_height, img_width]] * len(detections)
@@ -128,3 +147,22 @@ def detect_qr_codes(image: WorkflowImageData) -> sv.Detections:
         detections=detections,
         image=image,
     )
+
+
+def _empty_qr_detections() -> sv.Detections:
+    # empty arrays are never mutated in place, so they may be shared across results
+    return sv.Detections(
+        xyxy=_EMPTY_XYXY,
+        confidence=_EMPTY_CONFIDENCE,
+        class_id=_EMPTY_CLASS_ID,
+        data=dict(_EMPTY_DATA),
+    )
+
+
+def generate_detection_ids(detections_number: int) -> np.ndarray:
+    # single os.urandom() call for the whole batch instead of one per uuid4()
+    random_bytes = os.urandom(16 * detections_number)
+    detection_ids = np.empty(detections_number, dtype=object)
+    for i in range(detections_number):
+        detection_ids[i] = UUID(bytes=random_bytes[16 * i : 16 * (i + 1)], version=4)
+    return detection_ids
@@ -0,0 +1,196 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import cv2
+import numpy as np
+from supervision.annotators.base import BaseAnnotator, ImageType
+from supervision.detection.core import Detections
+from supervision.utils.conversion import ensure_cv2_image_for_annotation
+
+# pixelation of disjoint boxes is spread across threads (OpenCV and numpy release
+# GIL) only when there are enough pixels for it to outweigh task dispatch
+PARALLEL_PIXELATION_MIN_PIXELS = 250_000
+# overlaps are checked for every pair of boxes, so above that many boxes the check
+# is skipped and boxes are pixelated sequentially
+PARALLEL_PIXELATION_MAX_BOXES = 64
+PIXELATION_WORKERS_NUMBER = min(8, os.cpu_count() or 1)
+_PIXELATION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=PIXELATION_WORKERS_NUMBER, thread_name_prefix="pixelate"
+)
+SCRATCH_BUFFER_MAX_BYTES = 8 * 1024 * 1024
+# int32 block sums cannot overflow for ROIs up to this size
+INT32_SUMS_MAX_PIXELS = np.iinfo(np.int32).max // 255
+_SCRATCH = threading.local()
+
+
+class PixelateAnnotator(BaseAnnotator):
+    """
+    A class for pixelating regions in an image using provided detections.
+    Each `pixel_size` x `pixel_size` block of a region is filled with its mean color.
+    """
+
+    def __init__(self, pixel_size: int = 20):
+        """
+        Args:
+            pixel_size (int): The size of the pixelation.
+        """
+        self.pixel_size: int = pixel_size
+
+    @ensure_cv2_image_for_annotation
+    def annotate(self, scene: ImageType, detections: Detections) -> ImageType:
+        """
+        Annotates the given scene by pixelating regions based on the provided
+            detections.
+        Args:
+            scene (ImageType): The image where pixelating will be applied.
+                `ImageType` is a flexible type, accepting either `numpy.ndarray`
+                or `PIL.Image.Image`.
+            detections (Detections): Object detections to annotate.
+        Returns:
+            The annotated image, matching the type of `scene` (`numpy.ndarray`
+                or `PIL.Image.Image`)
+        """
+        if self.pixel_size <= 1:
+            # every block would be a single pixel already
+            return scene
+        image_height, image_width = scene.shape[:2]
+        # boxes are clamped to image and cast to int32 once for all detections
+        clipped_xyxy = np.clip(
+            detections.xyxy, 0, [image_width, image_height, image_width, image_height]
+        ).astype(np.int32)
+        # boxes left empty after clipping are dropped for all detections at once
+        non_empty = (clipped_xyxy[:, 2] > clipped_xyxy[:, 0]) & (
+            clipped_xyxy[:, 3] > clipped_xyxy[:, 1]
+        )
+
+        clipped_xyxy = clipped_xyxy[non_empty]
+        rois = [scene[y1:y2, x1:x2] for x1, y1, x2, y2 in clipped_xyxy.tolist()]
+        if _should_pixelate_in_parallel(xyxy=clipped_xyxy):
+            list(
+                _PIXELATION_EXECUTOR.map(
+                    lambda roi: _pixelate_roi(roi=roi, pixel_size=self.pixel_size),
+                    rois,
+                )
+            )
+        else:
+            for roi in rois:
+                _pixelate_roi(roi=roi, pixel_size=self.pixel_size)
+
+        return scene
+
+
+def _should_pixelate_in_parallel(xyxy: np.ndarray) -> bool:
+    if (
+        PIXELATION_WORKERS_NUMBER < 2
+        or not 2 <= len(xyxy) <= PARALLEL_PIXELATION_MAX_BOXES
+    ):
+        return False
+    widths, heights = xyxy[:, 2] - xyxy[:, 0], xyxy[:, 3] - xyxy[:, 1]
+    if np.dot(widths.astype(np.int64), heights) < PARALLEL_PIXELATION_MIN_PIXELS:
+        return False
+    # overlapping boxes are pixelated one after another, as each of them reads
+    # pixels written for previous one
+    overlapping = (xyxy[:, None, 0] < xyxy[None, :, 2]) & (
+        xyxy[None, :, 0] < xyxy[:, None, 2]
+    )
+    overlapping &= (xyxy[:, None, 1] < xyxy[None, :, 3]) & (
+        xyxy[None, :, 1] < xyxy[:, None, 3]
+    )
+    np.fill_diagonal(overlapping, False)
+    return not overlapping.any()
+
+
+def _pixelate_roi(roi: np.ndarray, pixel_size: int) -> None:
+    # pixelates ROI view in place, filling every block with its mean color
+    height, width = roi.shape[:2]
+    if height <= pixel_size and width <= pixel_size:
+        # whole ROI is a single block
+        channels_means = cv2.mean(roi)[: roi.shape[2] if roi.ndim == 3 else 1]
+        roi[...] = np.floor(np.array(channels_means) + 0.5)
+        return None
+    if height % pixel_size == 0 and width % pixel_size == 0:
+        # whole blocks only - INTER_AREA downscale by integer factor yields exact
+        # block means, INTER_NEAREST upscale writes them straight into the image
+        blocks = cv2.resize(
+            roi,
+            (width // pixel_size, height // pixel_size),
+            interpolation=cv2.INTER_AREA,
+        )
+        _upscale_into(blocks=blocks, target=roi)
+        return None
+    # partial blocks at ROI border are averaged over their own pixels - block sums
+    # are read from summed-area table, 4 lookups per block regardless of pixel_size
+    block_ys = np.append(np.arange(0, height, pixel_size), height)
+    block_xs = np.append(np.arange(0, width, pixel_size), width)
+    # int32 sums halve memory traffic of float64 ones, which are left for ROIs
+    # large enough to overflow int32
+    if height * width <= INT32_SUMS_MAX_PIXELS:
+        sums_depth, sums_dtype = cv2.CV_32S, np.int32
+    else:
+        sums_depth, sums_dtype = cv2.CV_64F, np.float64
+    table = cv2.integral(
+        roi,
+        sum=_get_scratch_buffer(
+            shape=(height + 1, width + 1) + roi.shape[2:], dtype=sums_dtype
+        ),
+        sdepth=sums_depth,
+    )
+    table = table[block_ys[:, None], block_xs].astype(np.int64)
+    block_sums = table[1:, 1:] - table[:-1, 1:] - table[1:, :-1] + table[:-1, :-1]
+    block_heights, block_widths = np.diff(block_ys), np.diff(block_xs)
+    block_areas = np.outer(block_heights, block_widths)
+    block_areas = block_areas.reshape(block_areas.shape + (1,) * (roi.ndim - 2))
+    blocks = ((block_sums + block_areas // 2) // block_areas).astype(roi.dtype)
+    # blocks are replicated straight into the image - whole blocks by upscale,
+    # partial ones at the border by broadcasting
+    whole_rows, whole_columns = height // pixel_size, width // pixel_size
+    whole_height, whole_width = whole_rows * pixel_size, whole_columns * pixel_size
+    if whole_rows and whole_columns:
+        _upscale_into(
+            blocks=np.ascontiguousarray(blocks[:whole_rows, :whole_columns]),
+            target=roi[:whole_height, :whole_width],
+        )
+    if whole_width < width:
+        roi[:whole_height, whole_width:] = np.repeat(
+            blocks[:whole_rows, -1:], pixel_size, axis=0
+        )
+    if whole_height < height:
+        roi[whole_height:, :whole_width] = np.repeat(
+            blocks[-1:, :whole_columns], pixel_size, axis=1
+        )
+    if whole_width < width and whole_height < height:
+        roi[whole_height:, whole_width:] = blocks[-1, -1]
+    return None
+
+
+def _upscale_into(blocks: np.ndarray, target: np.ndarray) -> None:
+    height, width = target.shape[:2]
+    if _is_cv2_compatible_view(view=target):
+        cv2.resize(blocks, (width, height), dst=target, interpolation=cv2.INTER_NEAREST)
+        return None
+    # views OpenCV cannot write into (e.g. with reversed channels) are assigned
+    target[...] = cv2.resize(
+        blocks, (width, height), interpolation=cv2.INTER_NEAREST
+    ).reshape(target.shape)
+    return None
+
+
+def _is_cv2_compatible_view(view: np.ndarray) -> bool:
+    # OpenCV writes only into views with densely packed pixels in rows of positive step
+    channels = view.shape[2] if view.ndim == 3 else 1
+    pixel_strides = (view.itemsize * channels, view.itemsize)[: view.ndim - 1]
+    return view.strides[0] > 0 and view.strides[1:] == pixel_strides
+
+
+def _get_scratch_buffer(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    # summed-area table is reused per thread, unless it is too large to be retained
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if size > SCRATCH_BUFFER_MAX_BYTES:
+        return np.empty(shape, dtype=dtype)
+    buffer = getattr(_SCRATCH, "buffer", None)
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, dtype=np.uint8)
+        _SCRATCH.buffer = buffer
+    return buffer[:size].view(dtype).reshape(shape)
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import List, Literal, Optional, Type, Union
 
 import supervision as sv
@@ -24,6 +25,12 @@ The `BoundingBoxVisualization` block draws a box around detected
 objects in an image using Supervision's `sv.RoundBoxAnnotator`.
 """
 
+ANNOTATOR_CACHE_SIZE = 32
+
+_COLOR_LOOKUP_CACHE = {
+    color_lookup.name: color_lookup for color_lookup in sv.ColorLookup
+}
+
 
 class BoundingBoxManifest(ColorableVisualizationManifest):
     type: Literal[f"{TYPE}"]
@@ -52,7 +59,8 @@ class BoundingBoxManifest(ColorableVisualizationManifest):
 class BoundingBoxVisualizationBlock(ColorableVisualizationBlock):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.annotatorCache = {}
+        # bounded, as per-frame parameters would otherwise grow the cache indefinitely
+        self.annotatorCache = OrderedDict()
 
     @classmethod
     def get_manifest(cls) -> Type[WorkflowBlockManifest]:
@@ -67,23 +75,25 @@ class BoundingBoxVisualizationBlock(ColorableVisualizationBlock):
         thickness: int,
         roundness: float,
     ) -> sv.annotators.base.BaseAnnotator:
-        key = "_".join(
-            map(str, [color_palette, palette_size, color_axis, thickness, roundness])
-        )
+        key = (color_palette, palette_size, color_axis, thickness, roundness)
 
-        if key not in self.annotatorCache:
+        if key in self.annotatorCache:
+            self.annotatorCache.move_to_end(key)
+        else:
+            if len(self.annotatorCache) >= ANNOTATOR_CACHE_SIZE:
+                self.annotatorCache.popitem(last=False)
             palette = self.getPalette(color_palette, palette_size, custom_colors)
 
             if roundness == 0:
                 self.annotatorCache[key] = sv.BoxAnnotator(
                     color=palette,
-                    color_lookup=getattr(sv.ColorLookup, color_axis),
+                    color_lookup=_COLOR_LOOKUP_CACHE[color_axis],
                     thickness=thickness,
                 )
             else:
                 self.annotatorCache[key] = sv.RoundBoxAnnotator(
                     color=palette,
-                    color_lookup=getattr(sv.ColorLookup, color_axis),
+                    color_lookup=_COLOR_LOOKUP_CACHE[color_axis],
                     thickness=thickness,
                     roundness=roundness,
                 )
@@ -110,6 +120,8 @@ class BoundingBoxVisualizationBlock(ColorableVisualizationBlock):
             roundness,
         )
 
+        # the copy cannot be skipped based on buffer ownership - the same image
+        # may be consumed by several steps, which must not see each other's drawings
         annotated_image = annotator.annotate(
             scene=image.numpy_image.copy() if copy_image else image.numpy_image,
             detections=predictions,
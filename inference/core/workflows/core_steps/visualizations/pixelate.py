@@ -3,6 +3,9 @@ from typing import Literal, Optional, Type, Union
 import supervision as sv
 from pydantic import ConfigDict, Field
 
+from inference.core.workflows.core_steps.visualizations.annotators.pixelate import (
+    PixelateAnnotator,
+)
 from inference.core.workflows.core_steps.visualizations.base import (
     OUTPUT_IMAGE_KEY,
     VisualizationBlock,
@@ -23,7 +26,8 @@ TYPE: str = "PixelateVisualization"
 SHORT_DESCRIPTION = "Pixelates detected objects in an image."
 LONG_DESCRIPTION = """
 The `PixelateVisualization` block pixelates detected
-objects in an image using Supervision's `sv.PixelateAnnotator`.
+objects in an image by filling each block of `pixel_size` pixels
+with its mean color.
 """
 
 
@@ -61,7 +65,7 @@ class PixelateVisualizationBlock(VisualizationBlock):
         key = "_".join(map(str, [pixel_size]))
 
         if key not in self.annotatorCache:
-            self.annotatorCache[key] = sv.PixelateAnnotator(pixel_size=pixel_size)
+            self.annotatorCache[key] = PixelateAnnotator(pixel_size=pixel_size)
         return self.annotatorCache[key]
 
     async def run(
@@ -71,6 +75,21 @@ class PixelateVisualizationBlock(VisualizationBlock):
         copy_image: bool,
         pixel_size: Optional[int],
     ) -> BlockResult:
+        return self._run(
+            image=image,
+            predictions=predictions,
+            copy_image=copy_image,
+            pixel_size=pixel_size,
+        )
+
+    def _run(
+        self,
+        image: WorkflowImageData,
+        predictions: sv.Detections,
+        copy_image: bool,
+        pixel_size: Optional[int],
+    ) -> BlockResult:
+        # pixelation is pure CPU work with nothing to await
         annotator = self.getAnnotator(
             pixel_size,
         )
@@ -6,14 +6,18 @@ import mimetypes
 import socket
 import sys
 import time
-from collections import defaultdict
+import weakref
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from functools import wraps
-from queue import Queue
 from threading import Event, Lock, Thread
 from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from inference.core.env import API_KEY, LAMBDA
 from inference.core.logger import logger
@@ -23,29 +27,67 @@ from inference.usage_tracking.utils import collect_func_params
 
 from .config import TelemetrySettings, get_telemetry_settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 ResourceID = str
 Usage = Union[DefaultDict[str, Any], Dict[str, Any]]
 ResourceUsage = Union[DefaultDict[ResourceID, Usage], Dict[ResourceID, Usage]]
 APIKey = str
 APIKeyUsage = Union[DefaultDict[APIKey, ResourceUsage], Dict[APIKey, ResourceUsage]]
+UsageKey = Tuple[APIKey, str, ResourceID]  # api_key, category, resource_id
+CollectedUsage = Dict[UsageKey, Usage]
 ResourceDetails = Dict[str, Any]
 SystemDetails = Dict[str, Any]
 UsagePayload = Union[APIKeyUsage, ResourceDetails, SystemDetails]
 
+USAGE_TEMPLATE: Usage = {
+    "timestamp_start": None,
+    "timestamp_stop": None,
+    "exec_session_id": None,
+    "processed_frames": 0,
+    "fps": 0,
+    "source_duration": 0,
+    "category": "",
+    "resource_id": "",
+    "hosted": LAMBDA,
+    "api_key": None,
+    "enterprise": False,
+}
+
+# usage is recorded under one of several locks picked by api_key,
+# so that recording for different API keys does not serialize (power of 2)
+USAGE_LOCKS_NUMBER = 16
+OFFLOAD_WORKERS_NUMBER = 8
+
+
+def dump_usage_json(payload: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(payload).encode("utf-8")
+
 
 class UsageCollector:
-    _lock = Lock()
+    _singleton_lock = Lock()
+    _workflow_resources: Dict[int, Tuple[ResourceDetails, ResourceID]] = {}
+    _cached_ip_hash: Optional[str] = None
+    _ip_hash_lock = Lock()
 
     def __new__(cls, *args, **kwargs):
-        with UsageCollector._lock:
+        with UsageCollector._singleton_lock:
             if not hasattr(cls, "_instance"):
                 cls._instance = super().__new__(cls)
                 cls._instance._queue = None
         return cls._instance
 
     def __init__(self):
-        with UsageCollector._lock:
-            if self._queue:
+        with UsageCollector._singleton_lock:
+            if self._queue is not None:
                 return
 
         # Async lock only for async protection, should not be shared between threads
@@ -58,12 +100,14 @@ class UsageCollector:
         self._exec_session_id = f"{time.time_ns()}_{uuid4().hex[:4]}"
 
         self._settings: TelemetrySettings = get_telemetry_settings()
-        self._usage: APIKeyUsage = self.empty_usage_dict(
-            exec_session_id=self._exec_session_id
-        )
+        self._usage: CollectedUsage = self.empty_usage_dict()
+        self._usage_locks = [Lock() for _ in range(USAGE_LOCKS_NUMBER)]
 
         # TODO: use persistent queue, i.e. https://pypi.org/project/persist-queue/
-        self._queue: "Queue[UsagePayload]" = Queue(maxsize=self._settings.queue_size)
+        # deque is not given maxlen as it would silently evict oldest usage,
+        # payloads are merged once queue_size is reached instead
+        self._queue: "deque[UsagePayload]" = deque()
+        self._queue_size = self._settings.queue_size
         self._queue_lock = Lock()
 
         self._system_info_sent: bool = False
@@ -72,38 +116,36 @@ class UsageCollector:
             defaultdict(dict)
         )
 
-        self._terminate_collector_thread = Event()
-        self._collector_thread = Thread(target=self._usage_collector, daemon=True)
-        self._collector_thread.start()
-
-        self._terminate_sender_thread = Event()
-        self._sender_thread = Thread(target=self._usage_sender, daemon=True)
-        self._sender_thread.start()
+        # keep-alive connections are reused across flushes, failed sends are
+        # enqueued back, hence no retries on this path
+        self._http_session = requests.Session()
+        http_adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=Retry(total=0)
+        )
+        self._http_session.mount("http://", http_adapter)
+        self._http_session.mount("https://", http_adapter)
+        api_usage_endpoint_url = self._settings.api_usage_endpoint_url.lower()
+        self._ssl_verify = not (
+            "localhost" in api_usage_endpoint_url
+            or "127.0.0.1" in api_usage_endpoint_url
+        )
+        self._offload_executor = ThreadPoolExecutor(
+            max_workers=OFFLOAD_WORKERS_NUMBER, thread_name_prefix="usage_offload"
+        )
 
-        atexit.register(self._cleanup)
+        # single thread both collects usage and sends it once per flush interval,
+        # it is only started once there is usage to send
+        self._terminate_worker_thread = Event()
+        self._worker_thread: Optional[Thread] = None
+        self._worker_thread_lock = Lock()
 
     @staticmethod
-    def empty_usage_dict(exec_session_id: str) -> APIKeyUsage:
-        return defaultdict(  # api_key
-            lambda: defaultdict(  # category:resource_id
-                lambda: {
-                    "timestamp_start": None,
-                    "timestamp_stop": None,
-                    "exec_session_id": exec_session_id,
-                    "processed_frames": 0,
-                    "fps": 0,
-                    "source_duration": 0,
-                    "category": "",
-                    "resource_id": "",
-                    "hosted": LAMBDA,
-                    "api_key": None,
-                    "enterprise": False,
-                }
-            )
-        )
+    def empty_usage_dict() -> CollectedUsage:
+        return {}
 
     @staticmethod
     def _merge_usage_dicts(d1: UsagePayload, d2: UsagePayload):
+        # d1 is merged into in place - callers pass an accumulator as d1
         merged = {}
         if d1 and d2 and d1.get("resource_id") != d2.get("resource_id"):
             raise ValueError("Cannot merge usage for different resource IDs")
@@ -117,14 +159,18 @@ class UsageCollector:
             merged["processed_frames"] = d1["processed_frames"] + d2["processed_frames"]
         if "source_duration" in d1 and "source_duration" in d2:
             merged["source_duration"] = d1["source_duration"] + d2["source_duration"]
-        return {**d1, **d2, **merged}
+        d1.update(d2)
+        d1.update(merged)
+        return d1
 
     def _dump_usage_queue_no_lock(self) -> List[APIKeyUsage]:
-        usage_payloads: List[APIKeyUsage] = []
-        while self._queue:
-            if self._queue.empty():
-                break
-            usage_payloads.append(self._queue.get_nowait())
+        if not self._queue:
+            return []
+        # only drainer pops (under _queue_lock) while producers append
+        # concurrently, popleft() each counted item so no append is lost
+        usage_payloads: List[APIKeyUsage] = [
+            self._queue.popleft() for _ in range(len(self._queue))
+        ]
         return usage_payloads
 
     def _dump_usage_queue_with_lock(self) -> List[APIKeyUsage]:
@@ -136,24 +182,43 @@ class UsageCollector:
     def _get_api_key_usage_containing_resource(
         api_key: APIKey, usage_payloads: List[APIKeyUsage]
     ) -> Optional[ResourceUsage]:
+        usages_containing_resource = (
+            UsageCollector._index_api_key_usages_containing_resource(
+                usage_payloads=usage_payloads
+            )
+        )
+        return usages_containing_resource.get(api_key if api_key else None)
+
+    @staticmethod
+    def _index_api_key_usages_containing_resource(
+        usage_payloads: List[APIKeyUsage],
+    ) -> Dict[Optional[APIKey], ResourceUsage]:
+        # first usage containing resource for each API key,
+        # under None - first usage containing resource for any API key
+        usages_containing_resource = {}
         for usage_payload in usage_payloads:
-            for other_api_key, resource_payloads in usage_payload.items():
-                if api_key and other_api_key != api_key:
-                    continue
-                if other_api_key is None:
+            for api_key, resource_payloads in usage_payload.items():
+                if api_key is None or api_key in usages_containing_resource:
                     continue
                 for resource_id, resource_usage in resource_payloads.items():
                     if not resource_id:
                         continue
                     if not resource_usage or "resource_id" not in resource_usage:
                         continue
-                    return resource_usage
-        return None
+                    usages_containing_resource[api_key] = resource_usage
+                    usages_containing_resource.setdefault(None, resource_usage)
+                    break
+        return usages_containing_resource
 
     @staticmethod
     def _zip_usage_payloads(usage_payloads: List[APIKeyUsage]) -> List[APIKeyUsage]:
         merged_api_key_usage_payloads: APIKeyUsage = {}
         system_info_payload = None
+        usages_containing_resource = (
+            UsageCollector._index_api_key_usages_containing_resource(
+                usage_payloads=usage_payloads
+            )
+        )
         for usage_payload in usage_payloads:
             for api_key, resource_payloads in usage_payload.items():
                 if api_key is None:
@@ -167,12 +232,7 @@ class UsageCollector:
                             resource_payloads,
                         )
                         continue
-                    api_key_usage_with_resource = (
-                        UsageCollector._get_api_key_usage_containing_resource(
-                            api_key=api_key,
-                            usage_payloads=usage_payloads,
-                        )
-                    )
+                    api_key_usage_with_resource = usages_containing_resource.get(None)
                     if not api_key_usage_with_resource:
                         system_info_payload = resource_payloads
                         continue
@@ -190,11 +250,8 @@ class UsageCollector:
                     resource_usage_payload,
                 ) in resource_payloads.items():
                     if resource_usage_key is None:
-                        api_key_usage_with_resource = (
-                            UsageCollector._get_api_key_usage_containing_resource(
-                                api_key=api_key,
-                                usage_payloads=usage_payloads,
-                            )
+                        api_key_usage_with_resource = usages_containing_resource.get(
+                            api_key if api_key else None
                         )
                         if not api_key_usage_with_resource:
                             system_info_payload = {None: resource_usage_payload}
@@ -211,11 +268,9 @@ class UsageCollector:
                     merged_resource_payload = merged_api_key_payload.setdefault(
                         resource_usage_key, {}
                     )
-                    merged_api_key_payload[resource_usage_key] = (
-                        UsageCollector._merge_usage_dicts(
-                            merged_resource_payload,
-                            resource_usage_payload,
-                        )
+                    UsageCollector._merge_usage_dicts(
+                        merged_resource_payload,
+                        resource_usage_payload,
                     )
 
         zipped_payloads = [merged_api_key_usage_payloads]
@@ -225,25 +280,28 @@ class UsageCollector:
         return zipped_payloads
 
     @staticmethod
-    def _hash(payload: str, length=5):
-        payload_hash = hashlib.sha256(payload.encode())
-        return payload_hash.hexdigest()[:length]
+    def _hash(payload: Union[str, bytes], length=5):
+        if isinstance(payload, str):
+            payload = payload.encode()
+        # only bytes needed for requested length are hex-encoded
+        payload_hash = hashlib.sha256(payload).digest()[: (length + 1) // 2]
+        return payload_hash.hex()[:length]
 
     def _enqueue_payload(self, payload: UsagePayload):
         logger.debug("Enqueuing usage payload %s", payload)
         if not payload:
             return
+        self._ensure_worker_started()
+        if len(self._queue) < self._queue_size:
+            self._queue.append(payload)
+            return
         with self._queue_lock:
-            if not self._queue.full():
-                self._queue.put(payload)
-            else:
-                usage_payloads = self._dump_usage_queue_no_lock()
-                usage_payloads.append(payload)
-                merged_usage_payloads = self._zip_usage_payloads(
-                    usage_payloads=usage_payloads,
-                )
-                for usage_payload in merged_usage_payloads:
-                    self._queue.put(usage_payload)
+            usage_payloads = self._dump_usage_queue_no_lock()
+            usage_payloads.append(payload)
+            merged_usage_payloads = self._zip_usage_payloads(
+                usage_payloads=usage_payloads,
+            )
+            self._queue.extend(merged_usage_payloads)
 
     @staticmethod
     def _calculate_resource_hash(resource_details: Dict[str, Any]) -> str:
@@ -294,16 +352,11 @@ class UsageCollector:
         self._enqueue_payload(payload=resource_details_payload)
 
     @staticmethod
-    def system_info(
-        exec_session_id: str,
-        api_key: Optional[str] = None,
-        ip_address: Optional[str] = None,
-        time_ns: Optional[int] = None,
-        enterprise: bool = False,
-    ) -> SystemDetails:
-        if ip_address:
-            ip_address_hash_hex = UsageCollector._hash(ip_address)
-        else:
+    def _get_ip_address_hash() -> str:
+        # IP discovery may hit DNS and open a socket, it is resolved once per process
+        with UsageCollector._ip_hash_lock:
+            if UsageCollector._cached_ip_hash is not None:
+                return UsageCollector._cached_ip_hash
             try:
                 ip_address: str = socket.gethostbyname(socket.gethostname())
             except:
@@ -318,7 +371,21 @@ class UsageCollector:
                 if s:
                     s.close()
 
+            UsageCollector._cached_ip_hash = UsageCollector._hash(ip_address)
+            return UsageCollector._cached_ip_hash
+
+    @staticmethod
+    def system_info(
+        exec_session_id: str,
+        api_key: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        time_ns: Optional[int] = None,
+        enterprise: bool = False,
+    ) -> SystemDetails:
+        if ip_address:
             ip_address_hash_hex = UsageCollector._hash(ip_address)
+        else:
+            ip_address_hash_hex = UsageCollector._get_ip_address_hash()
 
         if not time_ns:
             time_ns = time.time_ns()
@@ -398,17 +465,25 @@ class UsageCollector:
             api_key = API_KEY
         if not resource_id and resource_details:
             resource_id = UsageCollector._calculate_resource_hash(resource_details)
-        with UsageCollector._lock:
-            source_usage = self._usage[api_key][f"{category}:{resource_id}"]
+        usage_key = (api_key, category, resource_id)
+        self._ensure_worker_started()
+        with self._get_usage_lock(api_key=api_key):
+            source_usage = self._usage.get(usage_key)
+            if source_usage is None:
+                source_usage = self._usage[usage_key] = {
+                    **USAGE_TEMPLATE,
+                    "exec_session_id": self._exec_session_id,
+                    "category": category,
+                    "resource_id": resource_id,
+                    "api_key": api_key,
+                }
+            now = time.time_ns()
             if not source_usage["timestamp_start"]:
-                source_usage["timestamp_start"] = time.time_ns()
-            source_usage["timestamp_stop"] = time.time_ns()
+                source_usage["timestamp_start"] = now
+            source_usage["timestamp_stop"] = now
             source_usage["processed_frames"] += frames
             source_usage["fps"] = round(fps, 2)
             source_usage["source_duration"] += frames / fps if fps else 0
-            source_usage["category"] = category
-            source_usage["resource_id"] = resource_id
-            source_usage["api_key"] = api_key
             source_usage["enterprise"] = enterprise
             logger.debug("Updated usage: %s", source_usage)
 
@@ -425,6 +500,9 @@ class UsageCollector:
     ) -> DefaultDict[str, Any]:
         if self._settings.opt_out and not enterprise:
             return
+        if not resource_id and isinstance(resource_details, dict) and resource_details:
+            # hashed once here rather than separately by each of the calls below
+            resource_id = UsageCollector._calculate_resource_hash(resource_details)
         self.record_system_info(
             api_key=api_key,
             enterprise=enterprise,
@@ -482,28 +560,44 @@ class UsageCollector:
                 fps=fps,
             )
 
-    def _usage_collector(self):
+    def _ensure_worker_started(self):
+        if self._worker_thread is not None:
+            return
+        with self._worker_thread_lock:
+            if self._worker_thread is not None:
+                return
+            self._worker_thread = Thread(target=self._usage_worker, daemon=True)
+            self._worker_thread.start()
+            atexit.register(self._cleanup)
+
+    def _usage_worker(self):
         while True:
-            if self._terminate_collector_thread.wait(self._settings.flush_interval):
+            if self._terminate_worker_thread.wait(self._settings.flush_interval):
                 break
-            self._enqueue_usage_payload()
-        logger.debug("Terminating collector thread")
-        self._enqueue_usage_payload()
+            self.push_usage_payloads()
+        logger.debug("Terminating usage worker thread")
+        self.push_usage_payloads()
 
     def _enqueue_usage_payload(self):
         if not self._usage:
             return
-        with UsageCollector._lock:
-            self._enqueue_payload(payload=self._usage)
-            self._usage = self.empty_usage_dict(exec_session_id=self._exec_session_id)
+        with ExitStack() as stack:
+            for usage_lock in self._usage_locks:
+                stack.enter_context(usage_lock)
+            usage = self._usage
+            self._usage = self.empty_usage_dict()
+        self._enqueue_payload(payload=self._to_api_key_usage(usage=usage))
 
-    def _usage_sender(self):
-        while True:
-            if self._terminate_sender_thread.wait(self._settings.flush_interval):
-                break
-            self._flush_queue()
-        logger.debug("Terminating sender thread")
-        self._flush_queue()
+    @staticmethod
+    def _to_api_key_usage(usage: CollectedUsage) -> APIKeyUsage:
+        api_key_usage: APIKeyUsage = {}
+        for (api_key, category, resource_id), resource_usage in usage.items():
+            resource_usage_key = f"{category}:{resource_id}"
+            api_key_usage.setdefault(api_key, {})[resource_usage_key] = resource_usage
+        return api_key_usage
+
+    def _get_usage_lock(self, api_key: Optional[APIKey]) -> Lock:
+        return self._usage_locks[hash(api_key) & (USAGE_LOCKS_NUMBER - 1)]
 
     def _flush_queue(self):
         usage_payloads = self._dump_usage_queue_with_lock()
@@ -515,52 +609,81 @@ class UsageCollector:
         self._offload_to_api(payloads=merged_payloads)
 
     def _offload_to_api(self, payloads: List[APIKeyUsage]):
-        ssl_verify = True
-        if "localhost" in self._settings.api_usage_endpoint_url.lower():
-            ssl_verify = False
-        if "127.0.0.1" in self._settings.api_usage_endpoint_url.lower():
-            ssl_verify = False
-
         api_keys_failed = set()
         for payload in payloads:
+            api_keys_to_send = []
             for api_key, workflow_payloads in payload.items():
                 if any("processed_frames" not in w for w in workflow_payloads.values()):
                     api_keys_failed.add(api_key)
                     continue
-                enterprise = any(
-                    w.get("enterprise") for w in workflow_payloads.values()
-                )
-                try:
-                    logger.debug(
-                        "Offloading usage to %s, payload: %s",
-                        self._settings.api_usage_endpoint_url,
-                        workflow_payloads,
-                    )
-                    response = requests.post(
-                        self._settings.api_usage_endpoint_url,
-                        json=list(workflow_payloads.values()),
-                        verify=ssl_verify,
-                        headers={"Authorization": f"Bearer {api_key}"},
-                        timeout=1,
-                    )
-                except Exception as exc:
-                    logger.debug("Failed to send usage - %s", exc)
-                    api_keys_failed.add(api_key)
-                    continue
-                if response.status_code != 200:
-                    logger.debug(
-                        "Failed to send usage - got %s status code (%s)",
-                        response.status_code,
-                        response.raw,
-                    )
+                api_keys_to_send.append(api_key)
+            sent = self._send_usage_in_parallel(
+                api_keys=api_keys_to_send, payload=payload
+            )
+            for api_key, success in zip(api_keys_to_send, sent):
+                if not success:
                     api_keys_failed.add(api_key)
-                    continue
-            for api_key in list(payload.keys()):
-                if api_key not in api_keys_failed:
-                    del payload[api_key]
-            if payload:
+            failed_payload = {
+                api_key: payload[api_key]
+                for api_key in api_keys_failed
+                if api_key in payload
+            }
+            if failed_payload:
                 logger.debug("Enqueuing back unsent payload")
-                self._enqueue_payload(payload=payload)
+                self._enqueue_payload(payload=failed_payload)
+
+    def _send_usage_in_parallel(
+        self, api_keys: List[APIKey], payload: APIKeyUsage
+    ) -> List[bool]:
+        def send_usage(api_key: APIKey) -> bool:
+            return self._send_usage(
+                api_key=api_key,
+                workflow_payloads=payload[api_key],
+            )
+
+        if len(api_keys) > 1:
+            # usage for each API key is sent in parallel, so flush takes ~1 RTT
+            try:
+                return list(self._offload_executor.map(send_usage, api_keys))
+            except RuntimeError as exc:
+                # executor refuses new work once interpreter shutdown started,
+                # final flush from atexit handler must still go through
+                logger.debug("Sending usage sequentially - %s", exc)
+        return [send_usage(api_key) for api_key in api_keys]
+
+    @staticmethod
+    def _get_auth_headers(api_key: APIKey) -> Dict[str, str]:
+        # built per request - caching them would retain every API key ever seen
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _send_usage(self, api_key: APIKey, workflow_payloads: ResourceUsage) -> bool:
+        try:
+            logger.debug(
+                "Offloading usage to %s, payload: %s",
+                self._settings.api_usage_endpoint_url,
+                workflow_payloads,
+            )
+            response = self._http_session.post(
+                self._settings.api_usage_endpoint_url,
+                data=dump_usage_json(list(workflow_payloads.values())),
+                verify=self._ssl_verify,
+                headers=self._get_auth_headers(api_key=api_key),
+                timeout=1,
+            )
+        except Exception as exc:
+            logger.debug("Failed to send usage - %s", exc)
+            return False
+        if response.status_code != 200:
+            logger.debug(
+                "Failed to send usage - got %s status code (%s)",
+                response.status_code,
+                response.raw,
+            )
+            return False
+        return True
 
     def push_usage_payloads(self):
         self._enqueue_usage_payload()
@@ -576,7 +699,9 @@ class UsageCollector:
     @staticmethod
     def _resource_details_from_workflow_json(
         workflow_json: Dict[str, Any]
-    ) -> Tuple[ResourceID, ResourceDetails]:
+    ) -> ResourceDetails:
+        # "steps" is sent to the usage API and hashed into resource IDs as a list,
+        # its shape is part of the API contract and must stay stable
         if not isinstance(workflow_json, dict):
             raise ValueError("workflow_json must be dict")
         return {
@@ -587,6 +712,38 @@ class UsageCollector:
             ]
         }
 
+    @staticmethod
+    def _get_workflow_resource_details(
+        workflow: CompiledWorkflow,
+    ) -> Tuple[ResourceDetails, ResourceID]:
+        # compiled workflow is usually run for every frame of a stream - its details
+        # and hash are memoized for as long as the workflow object lives
+        workflow_key = id(workflow)
+        cached_resource = UsageCollector._workflow_resources.get(workflow_key)
+        if cached_resource is not None:
+            return cached_resource
+        workflow_json = {}
+        if hasattr(workflow, "workflow_json"):
+            workflow_json = workflow.workflow_json
+        resource_details = UsageCollector._resource_details_from_workflow_json(
+            workflow_json=workflow_json,
+        )
+        resource_hash = UsageCollector._calculate_resource_hash(
+            resource_details=resource_details
+        )
+        try:
+            weakref.finalize(
+                workflow, UsageCollector._workflow_resources.pop, workflow_key, None
+            )
+        except TypeError:
+            # object cannot be weakly referenced - its id may get reused, do not cache
+            return resource_details, resource_hash
+        UsageCollector._workflow_resources[workflow_key] = (
+            resource_details,
+            resource_hash,
+        )
+        return resource_details, resource_hash
+
     @staticmethod
     def _extract_usage_params_from_func_kwargs(
         usage_fps: float,
@@ -595,6 +752,7 @@ class UsageCollector:
         func: Callable[[Any], Any],
         args: List[Any],
         kwargs: Dict[str, Any],
+        usage_enterprise: bool = False,
     ) -> Dict[str, Any]:
         if not usage_api_key:
             usage_api_key = API_KEY
@@ -602,27 +760,22 @@ class UsageCollector:
         resource_details = {}
         resource_id = None
         category = None
+        enterprise = usage_enterprise
         if "workflow" in func_kwargs:
             workflow: CompiledWorkflow = func_kwargs["workflow"]
             if hasattr(workflow, "workflow_definition"):
                 # TODO: handle enterprise blocks here
                 workflow_definition = workflow.workflow_definition
-                enterprise = False
             if hasattr(workflow, "init_parameters"):
                 init_parameters = workflow.init_parameters
                 if "workflows_core.api_key" in init_parameters:
                     usage_api_key = init_parameters["workflows_core.api_key"]
-            workflow_json = {}
-            if hasattr(workflow, "workflow_json"):
-                workflow_json = workflow.workflow_json
-            resource_details = UsageCollector._resource_details_from_workflow_json(
-                workflow_json=workflow_json,
+            resource_details, resource_hash = (
+                UsageCollector._get_workflow_resource_details(workflow=workflow)
             )
             resource_id = usage_workflow_id
             if not resource_id and resource_details:
-                usage_workflow_id = UsageCollector._calculate_resource_hash(
-                    resource_details=resource_details
-                )
+                resource_id = resource_hash
             category = "workflows"
         elif "model_id" in func_kwargs:
             # TODO: handle model
@@ -658,8 +811,11 @@ class UsageCollector:
             usage_fps: float = 0,
             usage_api_key: Optional[str] = None,
             usage_workflow_id: Optional[str] = None,
+            usage_enterprise: bool = False,
             **kwargs,
         ):
+            if self._settings.opt_out and not usage_enterprise:
+                return func(*args, **kwargs)
             self.record_usage(
                 **self._extract_usage_params_from_func_kwargs(
                     usage_fps=usage_fps,
@@ -668,6 +824,7 @@ class UsageCollector:
                     func=func,
                     args=args,
                     kwargs=kwargs,
+                    usage_enterprise=usage_enterprise,
                 )
             )
             return func(*args, **kwargs)
@@ -678,8 +835,11 @@ class UsageCollector:
             usage_fps: float = 0,
             usage_api_key: Optional[str] = None,
             usage_workflow_id: Optional[str] = None,
+            usage_enterprise: bool = False,
             **kwargs,
         ):
+            if self._settings.opt_out and not usage_enterprise:
+                return await func(*args, **kwargs)
             await self.async_record_usage(
                 **self._extract_usage_params_from_func_kwargs(
                     usage_fps=usage_fps,
@@ -688,6 +848,7 @@ class UsageCollector:
                     func=func,
                     args=args,
                     kwargs=kwargs,
+                    usage_enterprise=usage_enterprise,
                 )
             )
             return await func(*args, **kwargs)
@@ -698,10 +859,21 @@ class UsageCollector:
             return sync_wrapper
 
     def _cleanup(self):
-        self._terminate_collector_thread.set()
-        self._collector_thread.join()
-        self._terminate_sender_thread.set()
-        self._sender_thread.join()
+        self._terminate_worker_thread.set()
+        if self._worker_thread is not None:
+            self._worker_thread.join()
+        self._offload_executor.shutdown(wait=True)
+        self._http_session.close()
+
+
+_usage_collector: Optional[UsageCollector] = None
+_usage_collector_lock = Lock()
 
 
-usage_collector = UsageCollector()
+def get_usage_collector() -> UsageCollector:
+    global _usage_collector
+    if _usage_collector is None:
+        with _usage_collector_lock:
+            if _usage_collector is None:
+                _usage_collector = UsageCollector()
+    return _usage_collector
@@ -1,5 +1,6 @@
 import inspect
-from typing import Any, Callable, Dict, Iterable
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Tuple
 
 from inference.core.logger import logger
 
@@ -7,19 +8,29 @@ from inference.core.logger import logger
 def collect_func_params(
     func: Callable[[Any], Any], args: Iterable[Any], kwargs: Dict[Any, Any]
 ) -> Dict[str, Any]:
-    signature = inspect.signature(func)
+    param_names, defaults = get_func_params_with_defaults(func)
 
     params = {}
     if args:
-        for param, arg_value in zip(signature.parameters.keys(), args):
+        for param, arg_value in zip(param_names, args):
             params[param] = arg_value
     if kwargs:
-        params = {**params, **kwargs}
-    defaults = set(signature.parameters.keys()).difference(set(params.keys()))
-    for default_arg in defaults:
-        params[default_arg] = signature.parameters[default_arg].default
+        params.update(kwargs)
+    for param in param_names:
+        if param not in params:
+            params[param] = defaults[param]
 
-    if set(params) != set(signature.parameters):
+    if len(params) != len(param_names):
         logger.error("Params mismatch for %s.%s", func.__module__, func.__name__)
 
     return params
+
+
+@lru_cache(maxsize=128)
+def get_func_params_with_defaults(
+    func: Callable[[Any], Any]
+) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    # inspect.signature() is costly and decorated functions are called per frame
+    parameters = inspect.signature(func).parameters
+    defaults = {name: parameter.default for name, parameter in parameters.items()}
+    return tuple(parameters), defaults
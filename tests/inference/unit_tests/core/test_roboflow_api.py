@@ -1,12 +1,21 @@
-from typing import Type
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Generator, Type
 from unittest import mock
 from unittest.mock import MagicMock
 
+import aiohttp
+import numpy as np
 import pytest
 import requests.exceptions
+from aioresponses import aioresponses
 from requests_mock import Mocker
+from requests_toolbelt.multipart.decoder import MultipartDecoder
 
 from inference.core import roboflow_api
+from inference.core.cache.memory import MemoryCache
 from inference.core.env import API_BASE_URL
 from inference.core.exceptions import (
     MalformedRoboflowAPIResponseError,
@@ -24,6 +33,8 @@ from inference.core.exceptions import (
 from inference.core.roboflow_api import (
     ModelEndpointType,
     annotate_image_at_roboflow,
+    async_annotate_image_at_roboflow,
+    async_register_image_at_roboflow,
     get_roboflow_active_learning_configuration,
     get_roboflow_dataset_type,
     get_roboflow_labeling_batches,
@@ -37,6 +48,7 @@ from inference.core.roboflow_api import (
     register_image_at_roboflow,
     wrap_roboflow_api_errors,
 )
+from inference.core.utils.image_utils import encode_image_to_jpeg_bytes
 from inference.core.utils.url_utils import wrap_url
 import json
 
@@ -45,6 +57,44 @@ class TestException(Exception):
     pass
 
 
+@pytest.fixture(autouse=True)
+def empty_cache() -> Generator[MemoryCache, None, None]:
+    with mock.patch.object(roboflow_api, "cache", MemoryCache()) as cache:
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def empty_model_cache_dir(tmp_path) -> Generator[str, None, None]:
+    with mock.patch.object(roboflow_api, "MODEL_CACHE_DIR", str(tmp_path)):
+        yield str(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def empty_api_data_lookups() -> Generator[OrderedDict, None, None]:
+    with mock.patch.object(
+        roboflow_api, "_API_DATA_LOOKUPS", OrderedDict()
+    ) as api_data_lookups:
+        yield api_data_lookups
+
+
+def _get_multipart_fields(request) -> dict:
+    decoder = MultipartDecoder(request.body, request.headers["Content-Type"])
+    fields = {}
+    for part in decoder.parts:
+        disposition = part.headers[b"Content-Disposition"].decode()
+        name = re.search(r' name="([^"]*)"', disposition).group(1)
+        filename = re.search(r' filename="([^"]*)"', disposition)
+        if filename is None:
+            fields[name] = part.text
+        else:
+            fields[name] = (
+                filename.group(1),
+                part.content,
+                part.headers[b"Content-Type"].decode(),
+            )
+    return fields
+
+
 def test_wrap_roboflow_api_errors_when_no_error_occurs() -> None:
     # given
 
@@ -59,6 +109,19 @@ def test_wrap_roboflow_api_errors_when_no_error_occurs() -> None:
     assert result == 5
 
 
+def test_wrap_roboflow_api_errors_preserves_wrapped_function_metadata() -> None:
+    # given
+
+    @wrap_roboflow_api_errors()
+    def my_fun(a: int, b: int) -> int:
+        """Adds numbers."""
+        return a + b
+
+    # then
+    assert my_fun.__name__ == "my_fun"
+    assert my_fun.__doc__ == "Adds numbers."
+
+
 @pytest.mark.parametrize(
     "exception_class", [ConnectionError, requests.exceptions.ConnectionError]
 )
@@ -177,7 +240,7 @@ def test_get_roboflow_workspace_when_wrong_api_key_used(requests_mock: Mocker) -
     assert requests_mock.last_request.query == "api_key=my_api_key&nocache=true"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_workspace_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -280,7 +343,7 @@ def test_get_roboflow_dataset_type_when_project_not_found_used(
     assert requests_mock.last_request.query == "api_key=my_api_key&nocache=true"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_dataset_type_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -424,7 +487,7 @@ def test_get_roboflow_model_type_when_wrong_version_used(
     assert requests_mock.last_request.query == "api_key=my_api_key&nocache=true"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_model_type_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -534,7 +597,7 @@ def test_get_roboflow_model_type_when_response_is_valid(
     assert result == "yolov8n"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_model_data_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -680,7 +743,304 @@ def test_get_roboflow_model_data_when_valid_response_expected(
     assert result == expected_response
 
 
-@mock.patch.object(roboflow_api.requests, "post")
+def test_get_roboflow_model_data_when_response_is_cached(
+    requests_mock: Mocker,
+) -> None:
+    # given
+    expected_response = {"ort": {"name": "cached-model"}}
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json=expected_response,
+    )
+
+    # when
+    first_result = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    second_result = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert first_result == expected_response
+    assert second_result == expected_response
+    assert requests_mock.call_count == 1
+
+
+def test_get_roboflow_model_data_when_disk_cache_is_disabled(
+    requests_mock: Mocker,
+    empty_model_cache_dir: str,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json={"ort": {"name": "cached-model"}},
+    )
+
+    # when
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert not os.path.exists(
+        os.path.join(empty_model_cache_dir, "api_data")
+    ), "Expected model data not to be persisted on disk by default"
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 3600)
+def test_get_roboflow_model_data_when_response_is_cached_on_disk(
+    requests_mock: Mocker,
+    empty_cache: MemoryCache,
+    empty_api_data_lookups: OrderedDict,
+) -> None:
+    # given
+    expected_response = {"ort": {"name": "cached-model"}}
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json=expected_response,
+    )
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    # simulating process restart
+    empty_cache.cache.clear()
+    empty_api_data_lookups.clear()
+
+    # when
+    result = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert result == expected_response
+    assert requests_mock.call_count == 1
+    assert (
+        empty_cache.get("roboflow_api_data:ort:cached_model/1")["api_data"]
+        == expected_response
+    ), "Expected disk cache hit to be promoted into memory cache"
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 3600)
+def test_get_roboflow_model_data_when_response_is_cached_on_disk_for_other_api_key(
+    requests_mock: Mocker,
+    empty_cache: MemoryCache,
+    empty_api_data_lookups: OrderedDict,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json={"ort": {"name": "cached-model"}},
+    )
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    # simulating process restart
+    empty_cache.cache.clear()
+    empty_api_data_lookups.clear()
+
+    # when
+    _ = get_roboflow_model_data(
+        api_key="other_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert requests_mock.call_count == 2
+    assert "api_key=other_api_key" in requests_mock.last_request.url
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 3600)
+def test_get_roboflow_model_data_when_memory_cache_expires_after_cold_start(
+    requests_mock: Mocker,
+    empty_cache: MemoryCache,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json={"ort": {"name": "cached-model"}},
+    )
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    empty_cache.cache.clear()
+
+    # when
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert (
+        requests_mock.call_count == 2
+    ), "Expected disk cache not to be used once memory cache entry expired"
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 3600)
+def test_get_roboflow_model_data_when_connection_error_occurs_and_response_is_cached_on_disk(
+    requests_mock: Mocker,
+    empty_cache: MemoryCache,
+) -> None:
+    # given
+    expected_response = {"ort": {"name": "cached-model"}}
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json=expected_response,
+    )
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    empty_cache.cache.clear()
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        exc=requests.exceptions.ConnectionError,
+    )
+
+    # when
+    result = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+
+    # then
+    assert result == expected_response
+
+
+@mock.patch.object(roboflow_api, "API_DATA_LOOKUPS_LIMIT", 2)
+def test_is_first_api_data_lookup_when_lookups_limit_exceeded() -> None:
+    # when
+    results = [
+        roboflow_api._is_first_api_data_lookup(cache_key=cache_key)
+        for cache_key in ["a", "b", "a", "c", "a", "b"]
+    ]
+
+    # then
+    assert results == [True, True, False, True, False, True]
+
+
+class LockCheckingOrderedDict(OrderedDict):
+    def __contains__(self, key) -> bool:
+        assert roboflow_api._API_DATA_LOOKUPS_LOCK.locked()
+        return super().__contains__(key)
+
+    def move_to_end(self, key, last: bool = True) -> None:
+        assert roboflow_api._API_DATA_LOOKUPS_LOCK.locked()
+        super().move_to_end(key, last=last)
+
+    def popitem(self, last: bool = True) -> tuple:
+        assert roboflow_api._API_DATA_LOOKUPS_LOCK.locked()
+        return super().popitem(last=last)
+
+
+@mock.patch.object(roboflow_api, "API_DATA_LOOKUPS_LIMIT", 1)
+def test_is_first_api_data_lookup_holds_lock_while_accessing_lookups() -> None:
+    # given
+    with mock.patch.object(
+        roboflow_api, "_API_DATA_LOOKUPS", LockCheckingOrderedDict()
+    ):
+        # when
+        results = [
+            roboflow_api._is_first_api_data_lookup(cache_key=cache_key)
+            for cache_key in ["a", "a", "b"]
+        ]
+
+    # then
+    assert results == [True, False, True]
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_API_DATA_DISK_CACHE_EXPIRE", 10)
+def test_get_roboflow_model_data_when_disk_cache_entry_expired(
+    requests_mock: Mocker,
+    empty_cache: MemoryCache,
+    empty_api_data_lookups: OrderedDict,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/ort/cached_model/1"),
+        json={"ort": {"name": "cached-model"}},
+    )
+    _ = get_roboflow_model_data(
+        api_key="my_api_key",
+        model_id="cached_model/1",
+        endpoint_type=ModelEndpointType.ORT,
+        device_id="some",
+    )
+    empty_cache.cache.clear()
+    empty_api_data_lookups.clear()
+
+    # when
+    with mock.patch.object(roboflow_api.time, "time", return_value=time.time() + 11):
+        _ = get_roboflow_model_data(
+            api_key="my_api_key",
+            model_id="cached_model/1",
+            endpoint_type=ModelEndpointType.ORT,
+            device_id="some",
+        )
+
+    # then
+    assert requests_mock.call_count == 2
+
+
+def test_jittered_ttl_stays_within_bounds() -> None:
+    # when
+    results = [roboflow_api._jittered_ttl(base=100, jitter=0.2) for _ in range(100)]
+
+    # then
+    assert all(80 <= result <= 120 for result in results)
+
+
+def test_should_expire_early_when_entry_already_expired() -> None:
+    # when
+    result = roboflow_api._should_expire_early(
+        fetch_duration=0.1, expires_at=time.time() - 1
+    )
+
+    # then
+    assert result is True
+
+
+def test_should_expire_early_when_entry_is_far_from_expiry() -> None:
+    # when
+    result = roboflow_api._should_expire_early(
+        fetch_duration=0.0, expires_at=time.time() + 3600
+    )
+
+    # then
+    assert result is False
+
+
+@mock.patch.object(roboflow_api._SESSION, "post")
 def test_register_image_at_roboflow_when_connection_error_occurs(
     post_mock: MagicMock,
 ) -> None:
@@ -724,8 +1084,8 @@ def test_register_image_at_roboflow_when_wrong_api_key_used(
         requests_mock.last_request.query
         == "api_key=my_api_key&batch=my-batch&tag=a&tag=b&tag=c%2fd"
     )
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -757,8 +1117,8 @@ def test_register_image_at_roboflow_when_wrong_dataset_used(
         requests_mock.last_request.query
         == "api_key=my_api_key&batch=my-batch&tag=a&tag=b&tag=c%2fd"
     )
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -790,8 +1150,8 @@ def test_register_image_at_roboflow_when_http_error_occurs(
         requests_mock.last_request.query
         == "api_key=my_api_key&batch=my-batch&tag=a&tag=b&tag=c%2fd"
     )
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -823,8 +1183,8 @@ def test_register_image_at_roboflow_when_response_parsing_error_occurs(
         requests_mock.last_request.query
         == "api_key=my_api_key&batch=my-batch&tag=a&tag=b&tag=c%2fd"
     )
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -855,8 +1215,8 @@ def test_register_image_at_roboflow_when_valid_response_returned(
         requests_mock.last_request.query
         == "api_key=my_api_key&batch=my-batch&tag=a&tag=b&tag=c%2fd"
     )
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -884,8 +1244,8 @@ def test_register_image_at_roboflow_when_valid_response_returned_and_no_tags_use
 
     # then
     assert requests_mock.last_request.query == "api_key=my_api_key&batch=my-batch"
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -893,6 +1253,34 @@ def test_register_image_at_roboflow_when_valid_response_returned_and_no_tags_use
     assert response == {"success": True, "id": "xxx"}
 
 
+def test_register_image_at_roboflow_when_numpy_image_given(
+    requests_mock: Mocker,
+) -> None:
+    # given
+    requests_mock.post(
+        url=wrap_url(f"{API_BASE_URL}/dataset/coins_detection/upload"),
+        json={"success": True, "id": "xxx"},
+    )
+    image = np.zeros((64, 64, 3), dtype=np.uint8)
+
+    # when
+    response = register_image_at_roboflow(
+        api_key="my_api_key",
+        dataset_id="coins_detection",
+        local_image_id="local_id",
+        image_bytes=image,
+        batch_name="my-batch",
+        jpeg_quality=70,
+    )
+
+    # then
+    uploaded_file = _get_multipart_fields(requests_mock.last_request)["file"]
+    assert uploaded_file[0] == "imageToUpload"
+    assert uploaded_file[1] == encode_image_to_jpeg_bytes(image, jpeg_quality=70)
+    assert uploaded_file[2] == "image/jpeg"
+    assert response == {"success": True, "id": "xxx"}
+
+
 def test_register_image_at_roboflow_when_duplicate_response_returned(
     requests_mock: Mocker,
 ) -> None:
@@ -913,8 +1301,8 @@ def test_register_image_at_roboflow_when_duplicate_response_returned(
 
     # then
     assert requests_mock.last_request.query == "api_key=my_api_key&batch=my-batch"
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -943,8 +1331,8 @@ def test_register_image_at_roboflow_when_error_response_returned(
 
     # then
     assert requests_mock.last_request.query == "api_key=my_api_key&batch=my-batch"
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -973,8 +1361,8 @@ def test_register_image_at_roboflow_when_lack_of_success_reported(
 
     # then
     assert requests_mock.last_request.query == "api_key=my_api_key&batch=my-batch"
-    assert requests_mock.last_request.text.fields["name"] == "local_id.jpg"
-    assert requests_mock.last_request.text.fields["file"] == (
+    assert _get_multipart_fields(requests_mock.last_request)["name"] == "local_id.jpg"
+    assert _get_multipart_fields(requests_mock.last_request)["file"] == (
         "imageToUpload",
         b"SOME_IMAGE_BYTES",
         "image/jpeg",
@@ -982,7 +1370,7 @@ def test_register_image_at_roboflow_when_lack_of_success_reported(
     assert str({"success": False}) in str(e.value)
 
 
-@mock.patch.object(roboflow_api.requests, "post")
+@mock.patch.object(roboflow_api._SESSION, "post")
 def test_annotate_image_at_roboflow_when_connection_error_occurs(
     post_mock: MagicMock,
 ) -> None:
@@ -1256,7 +1644,234 @@ def test_annotate_image_at_roboflow_when_successful_response_expected(
     assert result == {"success": True}
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_connection_error_occurs() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                exception=aiohttp.ClientConnectionError(),
+            )
+
+            # when
+            with pytest.raises(RoboflowAPIConnectionError):
+                _ = await async_register_image_at_roboflow(
+                    api_key="my_api_key",
+                    dataset_id="coins_detection",
+                    local_image_id="local_id",
+                    image_bytes=b"SOME_IMAGE_BYTES",
+                    batch_name="my-batch",
+                    session=session,
+                )
+
+
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_wrong_api_key_used() -> None:
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                status=401,
+            )
+
+            # when
+            with pytest.raises(RoboflowAPINotAuthorizedError):
+                _ = await async_register_image_at_roboflow(
+                    api_key="my_api_key",
+                    dataset_id="coins_detection",
+                    local_image_id="local_id",
+                    image_bytes=b"SOME_IMAGE_BYTES",
+                    batch_name="my-batch",
+                    session=session,
+                )
+
+
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_response_parsing_error_occurs() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                body="For sure not a JSON payload",
+            )
+
+            # when
+            with pytest.raises(MalformedRoboflowAPIResponseError):
+                _ = await async_register_image_at_roboflow(
+                    api_key="my_api_key",
+                    dataset_id="coins_detection",
+                    local_image_id="local_id",
+                    image_bytes=b"SOME_IMAGE_BYTES",
+                    batch_name="my-batch",
+                    session=session,
+                )
+
+
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_lack_of_success_reported() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                payload={"success": False},
+            )
+
+            # when
+            with pytest.raises(RoboflowAPIImageUploadRejectionError):
+                _ = await async_register_image_at_roboflow(
+                    api_key="my_api_key",
+                    dataset_id="coins_detection",
+                    local_image_id="local_id",
+                    image_bytes=b"SOME_IMAGE_BYTES",
+                    batch_name="my-batch",
+                    session=session,
+                )
+
+
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_valid_response_returned() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                payload={"success": True, "id": "xxx"},
+            )
+
+            # when
+            response = await async_register_image_at_roboflow(
+                api_key="my_api_key",
+                dataset_id="coins_detection",
+                local_image_id="local_id",
+                image_bytes=b"SOME_IMAGE_BYTES",
+                batch_name="my-batch",
+                tags=["a", "b", "c/d"],
+                session=session,
+            )
+
+            # then
+            _, requested_url = next(iter(m.requests.keys()))
+            assert requested_url.query["api_key"] == "my_api_key"
+            assert requested_url.query["batch"] == "my-batch"
+            assert requested_url.query.getall("tag") == ["a", "b", "c/d"]
+            assert response == {"success": True, "id": "xxx"}
+
+
+@pytest.mark.asyncio
+async def test_async_register_image_at_roboflow_when_numpy_image_given() -> None:
+    # given
+    image = np.zeros((64, 64, 3), dtype=np.uint8)
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/upload.*"),
+                payload={"success": True, "id": "xxx"},
+            )
+
+            # when
+            response = await async_register_image_at_roboflow(
+                api_key="my_api_key",
+                dataset_id="coins_detection",
+                local_image_id="local_id",
+                image_bytes=image,
+                batch_name="my-batch",
+                jpeg_quality=70,
+                session=session,
+            )
+
+            # then
+            request = next(iter(m.requests.values()))[0]
+            uploaded_files = [
+                value
+                for options, _, value in request.kwargs["data"]._fields
+                if options["name"] == "file"
+            ]
+            assert uploaded_files == [encode_image_to_jpeg_bytes(image, jpeg_quality=70)]
+            assert response == {"success": True, "id": "xxx"}
+
+
+@pytest.mark.asyncio
+async def test_async_annotate_image_at_roboflow_when_image_already_annotated() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/annotate/roboflow_id.*"),
+                status=409,
+            )
+
+            # when
+            with pytest.raises(RoboflowAPIIAlreadyAnnotatedError):
+                _ = await async_annotate_image_at_roboflow(
+                    api_key="my_api_key",
+                    dataset_id="coins_detection",
+                    local_image_id="local_id",
+                    roboflow_image_id="roboflow_id",
+                    annotation_content="some",
+                    annotation_file_type="txt",
+                    is_prediction=True,
+                    session=session,
+                )
+
+
+@pytest.mark.asyncio
+async def test_async_annotate_image_at_roboflow_when_successful_response_expected() -> (
+    None
+):
+    # given
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            m.post(
+                re.compile(r".*/dataset/coins_detection/annotate/roboflow_id.*"),
+                payload={"success": True},
+            )
+
+            # when
+            result = await async_annotate_image_at_roboflow(
+                api_key="my_api_key",
+                dataset_id="coins_detection",
+                local_image_id="local_id",
+                roboflow_image_id="roboflow_id",
+                annotation_content="some",
+                annotation_file_type="txt",
+                is_prediction=True,
+                session=session,
+            )
+
+            # then
+            assert result == {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_close_async_session() -> None:
+    # given
+    session = roboflow_api.get_async_session()
+
+    # when
+    await roboflow_api.close_async_session()
+
+    # then
+    assert session.closed
+    new_session = roboflow_api.get_async_session()
+    assert new_session is not session
+    await roboflow_api.close_async_session()
+
+
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_labeling_batches_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -1416,7 +2031,7 @@ def test_get_roboflow_labeling_batches_when_valid_response_returned(
     assert requests_mock.last_request.query == "api_key=my_api_key"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_labeling_jobs_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -1580,7 +2195,7 @@ def test_get_roboflow_labeling_jobs_when_valid_response_returned(
     assert requests_mock.last_request.query == "api_key=my_api_key"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_roboflow_active_learning_configuration_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -1688,7 +2303,112 @@ def test_get_roboflow_active_learning_configuration_when_malformed_response_retu
     ), "API key must be given in query"
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
+def test_get_roboflow_active_learning_configuration_when_connection_error_occurs_but_response_is_cached(
+    get_mock: MagicMock,
+    empty_cache: MemoryCache,
+) -> None:
+    # given
+    get_mock.side_effect = ConnectionError()
+    empty_cache.set(
+        roboflow_api._get_api_key_scoped_cache_key(
+            cache_key="roboflow_api_data:active_learning:my_workspace:coins_detection",
+            api_key="my_api_key",
+        )
+        + ":stale",
+        {"enabled": True},
+    )
+
+    # when
+    result = get_roboflow_active_learning_configuration(
+        api_key="my_api_key",
+        workspace_id="my_workspace",
+        dataset_id="coins_detection",
+    )
+
+    # then
+    assert result == {"enabled": True}
+
+
+@mock.patch.object(roboflow_api, "ROBOFLOW_CACHE_FALLBACK", False)
+@mock.patch.object(roboflow_api._SESSION, "get")
+def test_get_roboflow_active_learning_configuration_when_connection_error_occurs_and_fallback_disabled(
+    get_mock: MagicMock,
+    empty_cache: MemoryCache,
+) -> None:
+    # given
+    get_mock.side_effect = ConnectionError()
+    empty_cache.set(
+        roboflow_api._get_api_key_scoped_cache_key(
+            cache_key="roboflow_api_data:active_learning:my_workspace:coins_detection",
+            api_key="my_api_key",
+        )
+        + ":stale",
+        {"enabled": True},
+    )
+
+    # when
+    with pytest.raises(RoboflowAPIConnectionError):
+        _ = get_roboflow_active_learning_configuration(
+            api_key="my_api_key",
+            workspace_id="my_workspace",
+            dataset_id="coins_detection",
+        )
+
+
+def test_get_roboflow_active_learning_configuration_when_connection_error_occurs_for_other_api_key(
+    requests_mock: Mocker,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/my_workspace/coins_detection/active_learning"),
+        json={"enabled": True},
+    )
+    _ = get_roboflow_active_learning_configuration(
+        api_key="api_key_a",
+        workspace_id="my_workspace",
+        dataset_id="coins_detection",
+    )
+
+    # when
+    with mock.patch.object(
+        roboflow_api._SESSION, "get", side_effect=ConnectionError()
+    ), pytest.raises(RoboflowAPIConnectionError):
+        _ = get_roboflow_active_learning_configuration(
+            api_key="api_key_b",
+            workspace_id="my_workspace",
+            dataset_id="coins_detection",
+        )
+
+
+def test_get_roboflow_active_learning_configuration_when_response_is_cached(
+    requests_mock: Mocker,
+) -> None:
+    # given
+    requests_mock.get(
+        url=wrap_url(f"{API_BASE_URL}/my_workspace/coins_detection/active_learning"),
+        json={"enabled": True},
+    )
+
+    # when
+    first_result = get_roboflow_active_learning_configuration(
+        api_key="my_api_key",
+        workspace_id="my_workspace",
+        dataset_id="coins_detection",
+    )
+    second_result = get_roboflow_active_learning_configuration(
+        api_key="my_api_key",
+        workspace_id="my_workspace",
+        dataset_id="coins_detection",
+    )
+
+    # then
+    assert first_result == {"enabled": True}
+    assert second_result == {"enabled": True}
+    assert requests_mock.call_count == 1
+
+
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_workflow_specification_when_connection_error_occurs(
     get_mock: MagicMock,
 ) -> None:
@@ -1705,7 +2425,7 @@ def test_get_workflow_specification_when_connection_error_occurs(
         )
 
 
-@mock.patch.object(roboflow_api.requests, "get")
+@mock.patch.object(roboflow_api._SESSION, "get")
 def test_get_workflow_specification_when_connection_error_occurs_but_file_is_cached(
     get_mock: MagicMock,
 ) -> None:
@@ -1918,3 +2638,45 @@ def test_get_workflow_specification_when_valid_response_given(
             }
         ],
     }
+
+
+def test_add_params_to_url_when_no_params_given() -> None:
+    # when
+    result = roboflow_api._add_params_to_url(url="https://some.com", params=[])
+
+    # then
+    assert result == "https://some.com"
+
+
+def test_add_params_to_url_when_params_require_escaping() -> None:
+    # when
+    result = roboflow_api._add_params_to_url(
+        url="https://some.com",
+        params=[("tag", "a b"), ("tag", "c/d"), ("api_key", "my_api_key")],
+    )
+
+    # then
+    assert result == "https://some.com?tag=a+b&tag=c%2Fd&api_key=my_api_key"
+
+
+@mock.patch.object(roboflow_api, "orjson", None)
+def test_workflow_response_cache_round_trip_when_orjson_not_available(
+    tmp_path,
+) -> None:
+    # given
+    cache_file = str(tmp_path / "workflow" / "my_workspace" / "some_workflow.json")
+    response = {"workflow": {"config": json.dumps({"specification": "some"})}}
+
+    # when
+    with mock.patch.object(
+        roboflow_api, "get_workflow_cache_file", return_value=cache_file
+    ):
+        roboflow_api.cache_workflow_response(
+            workspace_id="my_workspace", workflow_id="some_workflow", response=response
+        )
+        result = roboflow_api.load_cached_workflow_response(
+            workspace_id="my_workspace", workflow_id="some_workflow"
+        )
+
+    # then
+    assert result == response
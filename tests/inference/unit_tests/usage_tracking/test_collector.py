@@ -1,38 +1,87 @@
 import hashlib
 import json
 import sys
+from collections import deque
+from threading import Lock
+from types import SimpleNamespace
+from unittest import mock
 
+import numpy as np
 import pytest
 
 from inference.core.env import LAMBDA
-from inference.usage_tracking.collector import UsageCollector
+from inference.usage_tracking import collector as collector_module
+from inference.usage_tracking.collector import (
+    UsageCollector,
+    dump_usage_json,
+    get_usage_collector,
+)
 
 
 def test_create_empty_usage_dict():
+    # when
+    usage_dict = UsageCollector.empty_usage_dict()
+
+    # then
+    assert usage_dict == {}
+
+
+def test_update_usage_payload_creates_usage_from_template():
     # given
-    usage_default_dict = UsageCollector.empty_usage_dict(exec_session_id="exec_session_id")
+    collector = UsageCollector()
 
     # when
-    usage_default_dict["fake_api_key"]["category:fake_id"]
+    with mock.patch.object(collector, "_usage", UsageCollector.empty_usage_dict()):
+        collector._update_usage_payload(
+            source="source",
+            category="category",
+            frames=10,
+            api_key="fake_api_key",
+            resource_id="fake_id",
+            fps=10,
+        )
+        usage = collector._usage
 
     # then
-    assert json.dumps(usage_default_dict) == json.dumps({
-        "fake_api_key": {
-            "category:fake_id": {
-                "timestamp_start": None,
-                "timestamp_stop": None,
-                "exec_session_id": "exec_session_id",
-                "processed_frames": 0,
-                "fps": 0,
-                "source_duration": 0,
-                "category": "",
-                "resource_id": "",
-                "hosted": LAMBDA,
-                "api_key": None,
-                "enterprise": False,
-            }
-        }
-    })
+    assert list(usage) == [("fake_api_key", "category", "fake_id")]
+    source_usage = usage[("fake_api_key", "category", "fake_id")]
+    assert source_usage["timestamp_start"] == source_usage["timestamp_stop"]
+    assert {
+        k: v
+        for k, v in source_usage.items()
+        if k not in {"timestamp_start", "timestamp_stop"}
+    } == {
+        "exec_session_id": collector._exec_session_id,
+        "processed_frames": 10,
+        "fps": 10,
+        "source_duration": 1,
+        "category": "category",
+        "resource_id": "fake_id",
+        "hosted": LAMBDA,
+        "api_key": "fake_api_key",
+        "enterprise": False,
+    }
+
+
+def test_to_api_key_usage():
+    # given
+    usage = {
+        ("api1", "workflows", "some"): {"processed_frames": 1},
+        ("api1", "model", "other"): {"processed_frames": 2},
+        ("api2", "workflows", "some"): {"processed_frames": 3},
+    }
+
+    # when
+    result = UsageCollector._to_api_key_usage(usage=usage)
+
+    # then
+    assert result == {
+        "api1": {
+            "workflows:some": {"processed_frames": 1},
+            "model:other": {"processed_frames": 2},
+        },
+        "api2": {"workflows:some": {"processed_frames": 3}},
+    }
 
 
 def test_merge_usage_dicts_raises_on_mismatched_resource_id():
@@ -92,6 +141,20 @@ def test_merge_usage_dicts():
     }
 
 
+def test_merge_usage_dicts_merges_into_first_dict_in_place():
+    # given
+    usage_payload_1 = {"resource_id": "some", "processed_frames": 1}
+    usage_payload_2 = {"resource_id": "some", "processed_frames": 2, "fps": 10}
+
+    # when
+    result = UsageCollector._merge_usage_dicts(d1=usage_payload_1, d2=usage_payload_2)
+
+    # then
+    assert result is usage_payload_1
+    assert usage_payload_1 == {"resource_id": "some", "processed_frames": 3, "fps": 10}
+    assert usage_payload_2 == {"resource_id": "some", "processed_frames": 2, "fps": 10}
+
+
 def test_get_api_key_usage_containing_resource_with_no_payload_containing_api_key():
     # given
     usage_payloads = [
@@ -520,3 +583,194 @@ def test_system_info():
     }
     for k, v in expected_system_info.items():
         assert system_info[k] == v
+
+
+@pytest.mark.parametrize("length", [1, 5, 6, 64])
+def test_hash_accepts_str_and_bytes(length: int):
+    # when
+    str_hash = UsageCollector._hash("w.x.y.z", length=length)
+    bytes_hash = UsageCollector._hash(b"w.x.y.z", length=length)
+
+    # then
+    assert str_hash == bytes_hash == hashlib.sha256(b"w.x.y.z").hexdigest()[:length]
+
+
+def test_get_workflow_resource_details_is_memoized_per_workflow_object():
+    # given
+    class Workflow:
+        workflow_json = {"steps": [{"type": "ObjectDetectionModel", "name": "det"}]}
+
+    workflow = Workflow()
+
+    # when
+    first_result = UsageCollector._get_workflow_resource_details(workflow=workflow)
+    workflow.workflow_json = {"steps": []}
+    second_result = UsageCollector._get_workflow_resource_details(workflow=workflow)
+    workflow_key = id(workflow)
+    del workflow
+
+    # then
+    assert first_result == second_result == (
+        {"steps": ["ObjectDetectionModel:det"]},
+        UsageCollector._calculate_resource_hash(
+            resource_details={"steps": ["ObjectDetectionModel:det"]}
+        ),
+    )
+    assert workflow_key not in UsageCollector._workflow_resources
+
+
+def test_dump_usage_queue_no_lock_drains_whole_queue():
+    # given
+    queue = deque({f"api{i}": {}} for i in range(3))
+    collector = SimpleNamespace(_queue=queue)
+
+    # when
+    usage_payloads = UsageCollector._dump_usage_queue_no_lock(collector)
+
+    # then
+    assert usage_payloads == [{"api0": {}}, {"api1": {}}, {"api2": {}}]
+    assert len(queue) == 0
+
+
+def test_enqueue_payload_merges_queued_payloads_when_queue_is_full():
+    # given
+    queue = deque(
+        [
+            {"api1": {"model:a": {"processed_frames": 1}}},
+            {"api2": {"model:b": {"processed_frames": 1}}},
+        ]
+    )
+    collector = SimpleNamespace(
+        _queue=queue,
+        _queue_size=2,
+        _queue_lock=Lock(),
+        _ensure_worker_started=lambda: None,
+        _dump_usage_queue_no_lock=lambda: UsageCollector._dump_usage_queue_no_lock(
+            collector
+        ),
+        _zip_usage_payloads=UsageCollector._zip_usage_payloads,
+    )
+
+    # when
+    UsageCollector._enqueue_payload(
+        collector, {"api1": {"model:a": {"processed_frames": 2}}}
+    )
+
+    # then
+    assert len(queue) == 1
+    assert queue[0]["api1"]["model:a"]["processed_frames"] == 3
+    assert queue[0]["api2"]["model:b"]["processed_frames"] == 1
+
+
+def test_usage_decorator_skips_usage_extraction_when_opted_out():
+    # given
+    collector = UsageCollector()
+
+    @collector
+    def increment(value: int) -> int:
+        return value + 1
+
+    # when
+    with mock.patch.object(
+        collector, "_settings", SimpleNamespace(opt_out=True)
+    ), mock.patch.object(
+        UsageCollector, "_extract_usage_params_from_func_kwargs"
+    ) as extract_usage_params_mock:
+        result = increment(1)
+
+    # then
+    assert result == 2
+    extract_usage_params_mock.assert_not_called()
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_dump_usage_json(orjson_available: bool):
+    # given
+    payload = [{"resource_id": "some", "fps": np.float64(29.97), "processed_frames": 1}]
+    orjson = collector_module.orjson if orjson_available else None
+
+    # when
+    with mock.patch.object(collector_module, "orjson", orjson):
+        result = dump_usage_json(payload)
+
+    # then
+    assert json.loads(result) == [
+        {"resource_id": "some", "fps": 29.97, "processed_frames": 1}
+    ]
+
+
+def test_offload_to_api_enqueues_back_only_failed_api_keys():
+    # given
+    collector = UsageCollector()
+    payload = {
+        "sent": {"model:a": {"processed_frames": 1}},
+        "failed": {"model:b": {"processed_frames": 1}},
+        "malformed": {"model:c": {}},
+    }
+
+    # when
+    with mock.patch.object(
+        collector, "_send_usage", side_effect=lambda api_key, **_: api_key == "sent"
+    ), mock.patch.object(collector, "_enqueue_payload") as enqueue_payload_mock:
+        collector._offload_to_api(payloads=[payload])
+
+    # then
+    enqueue_payload_mock.assert_called_once_with(
+        payload={
+            "failed": {"model:b": {"processed_frames": 1}},
+            "malformed": {"model:c": {}},
+        }
+    )
+
+
+def test_system_info_resolves_ip_address_once():
+    # given
+    with mock.patch.object(
+        UsageCollector, "_cached_ip_hash", None
+    ), mock.patch.object(
+        collector_module.socket, "gethostbyname", return_value="10.0.0.1"
+    ) as gethostbyname_mock:
+        # when
+        first_system_info = UsageCollector.system_info(exec_session_id="exec1")
+        second_system_info = UsageCollector.system_info(exec_session_id="exec2")
+
+    # then
+    assert gethostbyname_mock.call_count == 1
+    assert (
+        first_system_info["ip_address_hash"]
+        == second_system_info["ip_address_hash"]
+        == UsageCollector._hash("10.0.0.1")
+    )
+
+
+def test_get_usage_collector_returns_singleton():
+    # when
+    usage_collector = get_usage_collector()
+
+    # then
+    assert usage_collector is get_usage_collector()
+    assert usage_collector is UsageCollector()
+
+
+def test_ensure_worker_started_starts_worker_thread_once():
+    # given
+    collector = SimpleNamespace(
+        _worker_thread=None,
+        _worker_thread_lock=Lock(),
+        _usage_worker=mock.MagicMock(),
+        _cleanup=mock.MagicMock(),
+    )
+
+    # when
+    with mock.patch.object(
+        collector_module, "Thread"
+    ) as thread_mock, mock.patch.object(
+        collector_module.atexit, "register"
+    ) as atexit_register_mock:
+        UsageCollector._ensure_worker_started(collector)
+        UsageCollector._ensure_worker_started(collector)
+
+    # then
+    thread_mock.assert_called_once_with(target=collector._usage_worker, daemon=True)
+    thread_mock.return_value.start.assert_called_once_with()
+    atexit_register_mock.assert_called_once_with(collector._cleanup)
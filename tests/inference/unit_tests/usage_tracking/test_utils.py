@@ -0,0 +1,44 @@
+import inspect
+
+from inference.usage_tracking.utils import (
+    collect_func_params,
+    get_func_params_with_defaults,
+)
+
+
+def test_collect_func_params():
+    # given
+    def func(a, b, c=3, d=4):
+        pass
+
+    # when
+    params = collect_func_params(func=func, args=(1,), kwargs={"b": 2, "d": 5})
+
+    # then
+    assert params == {"a": 1, "b": 2, "c": 3, "d": 5}
+
+
+def test_collect_func_params_when_default_not_provided():
+    # given
+    def func(a, b):
+        pass
+
+    # when
+    params = collect_func_params(func=func, args=(1,), kwargs={})
+
+    # then
+    assert params == {"a": 1, "b": inspect.Parameter.empty}
+
+
+def test_get_func_params_with_defaults_is_cached():
+    # given
+    def func(a, b=2):
+        pass
+
+    # when
+    first_result = get_func_params_with_defaults(func)
+    second_result = get_func_params_with_defaults(func)
+
+    # then
+    assert first_result == (("a", "b"), {"a": inspect.Parameter.empty, "b": 2})
+    assert first_result is second_result
@@ -5,6 +5,7 @@ from pydantic import ValidationError
 from inference.core.workflows.core_steps.models.third_party.qr_code_detection import (
     BlockManifest,
     QRCodeDetectorBlock,
+    generate_detection_ids,
 )
 from inference.core.workflows.entities.base import (
     Batch,
@@ -119,3 +120,77 @@ async def test_qr_code_detection(qr_codes_image: np.ndarray) -> None:
         assert np.allclose(root_parent_dimensions, np.array(qr_codes_image.shape[:2]))
         assert np.allclose(parent_coordinates, np.array([0, 0]))
         assert np.allclose(parent_dimensions, np.array(qr_codes_image.shape[:2]))
+
+
+@pytest.mark.asyncio
+async def test_qr_code_detection_preserves_batch_order(
+    qr_codes_image: np.ndarray,
+) -> None:
+    # given
+    step = QRCodeDetectorBlock()
+    images = Batch(
+        content=[
+            WorkflowImageData(
+                parent_metadata=ImageParentMetadata(parent_id="$inputs.image"),
+                numpy_image=np.zeros_like(qr_codes_image),
+            ),
+            WorkflowImageData(
+                parent_metadata=ImageParentMetadata(parent_id="$inputs.image"),
+                numpy_image=qr_codes_image,
+            ),
+            WorkflowImageData(
+                parent_metadata=ImageParentMetadata(parent_id="$inputs.image"),
+                numpy_image=np.zeros_like(qr_codes_image),
+            ),
+        ],
+        indices=[(0,), (1,), (2,)],
+    )
+
+    # when
+    result = await step.run(images=images)
+
+    # then
+    assert [len(element["predictions"]) for element in result] == [0, 3, 0]
+
+
+def test_generate_detection_ids() -> None:
+    # when
+    result = generate_detection_ids(detections_number=16)
+
+    # then
+    assert result.shape == (16,)
+    assert len(set(result)) == 16
+    assert all(detection_id.version == 4 for detection_id in result)
+
+
+def test_generate_detection_ids_when_no_detections() -> None:
+    # when
+    result = generate_detection_ids(detections_number=0)
+
+    # then
+    assert result.shape == (0,)
+
+
+@pytest.mark.asyncio
+async def test_qr_code_detection_when_no_codes_in_image() -> None:
+    # given
+    step = QRCodeDetectorBlock()
+    images = Batch(
+        content=[
+            WorkflowImageData(
+                parent_metadata=ImageParentMetadata(parent_id="$inputs.image"),
+                numpy_image=np.zeros((192, 168, 3), dtype=np.uint8),
+            )
+        ],
+        indices=[(0,)],
+    )
+
+    # when
+    result = await step.run(images=images)
+
+    # then
+    preds = result[0]["predictions"]
+    assert len(preds) == 0
+    assert len(preds["parent_id"]) == 0
+    assert len(preds["data"]) == 0
+    assert len(preds["detection_id"]) == 0
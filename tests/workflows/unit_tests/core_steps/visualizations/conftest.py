@@ -0,0 +1,27 @@
+import asyncio
+from typing import Iterator
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    # async block tests of a module share one loop instead of creating one per test -
+    # overriding `event_loop` fixture relies on pytest-asyncio<=0.21.1 pinned in
+    # requirements, newer versions deprecate overriding it
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def random_image(tmp_path_factory: pytest.TempPathFactory) -> np.ndarray:
+    # generated once and memory-mapped read-only - np.ascontiguousarray() returns
+    # read-only view of it, tests mutating the image must take .copy() instead
+    path = tmp_path_factory.mktemp("visualizations") / "random_image.npy"
+    np.save(
+        path,
+        np.random.default_rng(0).integers(0, 255, (1000, 1000, 3), dtype=np.uint8),
+    )
+    return np.load(path, mmap_mode="r")
@@ -53,11 +53,11 @@ def test_blur_validation_when_invalid_image_is_given() -> None:
         _ = BlurManifest.model_validate(data)
 
 @pytest.mark.asyncio
-async def test_blur_visualization_block() -> None:
+async def test_blur_visualization_block(random_image: np.ndarray) -> None:
     # given
     block = BlurVisualizationBlock()
 
-    start_image = np.random.randint(0, 255, (1000, 1000, 3), dtype=np.uint8)
+    start_image = np.ascontiguousarray(random_image)
     output = await block.run(
         image=WorkflowImageData(
             parent_metadata=ImageParentMetadata(parent_id="some"),
@@ -4,6 +4,7 @@ import supervision as sv
 from pydantic import ValidationError
 
 from inference.core.workflows.core_steps.visualizations.bounding_box import (
+    ANNOTATOR_CACHE_SIZE,
     BoundingBoxManifest,
     BoundingBoxVisualizationBlock,
 )
@@ -135,4 +136,40 @@ async def test_bounding_box_visualization_block_nocopy() -> None:
     assert not np.array_equal(output.get("image").numpy_image, np.zeros((1000, 1000, 3), dtype=np.uint8))
 
     # check if the image reference references the same memory space as the start_image
-    assert output.get("image").numpy_image.__array_interface__['data'][0] == start_image.__array_interface__['data'][0]
\ No newline at end of file
+    assert output.get("image").numpy_image.__array_interface__['data'][0] == start_image.__array_interface__['data'][0]
+
+
+def test_bounding_box_annotator_cache_is_bounded() -> None:
+    # given
+    block = BoundingBoxVisualizationBlock()
+    first_annotator = block.getAnnotator(
+        color_palette="DEFAULT",
+        palette_size=10,
+        custom_colors=[],
+        color_axis="CLASS",
+        thickness=1,
+        roundness=0,
+    )
+
+    # when
+    for thickness in range(2, ANNOTATOR_CACHE_SIZE + 2):
+        _ = block.getAnnotator(
+            color_palette="DEFAULT",
+            palette_size=10,
+            custom_colors=[],
+            color_axis="CLASS",
+            thickness=thickness,
+            roundness=0,
+        )
+    recreated_annotator = block.getAnnotator(
+        color_palette="DEFAULT",
+        palette_size=10,
+        custom_colors=[],
+        color_axis="CLASS",
+        thickness=1,
+        roundness=0,
+    )
+
+    # then
+    assert len(block.annotatorCache) == ANNOTATOR_CACHE_SIZE
+    assert recreated_annotator is not first_annotator
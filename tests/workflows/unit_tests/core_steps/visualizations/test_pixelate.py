@@ -1,8 +1,17 @@
+from typing import Tuple
+from unittest import mock
+
 import numpy as np
 import pytest
 import supervision as sv
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
+from inference.core.workflows.core_steps.visualizations.annotators import (
+    pixelate as pixelate_annotator_module,
+)
+from inference.core.workflows.core_steps.visualizations.annotators.pixelate import (
+    PixelateAnnotator,
+)
 from inference.core.workflows.core_steps.visualizations.pixelate import (
     PixelateManifest,
     PixelateVisualizationBlock,
@@ -13,6 +22,8 @@ from inference.core.workflows.entities.base import (
     ImageParentMetadata,
 )
 
+PIXELATE_MANIFEST_ADAPTER = TypeAdapter(PixelateManifest)
+
 
 @pytest.mark.parametrize("images_field_alias", ["images", "image"])
 def test_pixelate_validation_when_valid_manifest_is_given(images_field_alias: str) -> None:
@@ -26,7 +37,7 @@ def test_pixelate_validation_when_valid_manifest_is_given(images_field_alias: st
     }
 
     # when
-    result = PixelateManifest.model_validate(data)
+    result = PIXELATE_MANIFEST_ADAPTER.validate_python(data)
 
     # then
     assert result == PixelateManifest(
@@ -50,20 +61,27 @@ def test_pixelate_validation_when_invalid_image_is_given() -> None:
 
     # when
     with pytest.raises(ValidationError):
-        _ = PixelateManifest.model_validate(data)
+        _ = PIXELATE_MANIFEST_ADAPTER.validate_python(data)
 
 
-@pytest.mark.asyncio
-async def test_pixelate_visualization_block() -> None:
+@pytest.fixture(scope="module")
+def start_image_data(random_image: np.ndarray) -> Tuple[np.ndarray, WorkflowImageData]:
+    start_image = np.ascontiguousarray(random_image)
+    return start_image, WorkflowImageData(
+        parent_metadata=ImageParentMetadata(parent_id="some"),
+        numpy_image=start_image,
+    )
+
+
+def test_pixelate_visualization_block(
+    start_image_data: Tuple[np.ndarray, WorkflowImageData],
+) -> None:
     # given
     block = PixelateVisualizationBlock()
+    start_image, image = start_image_data
 
-    start_image = np.random.randint(0, 255, (1000, 1000, 3), dtype=np.uint8)
-    output = await block.run(
-        image=WorkflowImageData(
-            parent_metadata=ImageParentMetadata(parent_id="some"),
-            numpy_image=start_image,
-        ),
+    output = block._run(
+        image=image,
         predictions=sv.Detections(
             xyxy=np.array(
                 [[0, 0, 20, 20], [80, 80, 120, 120], [450, 450, 550, 550]], dtype=np.float64
@@ -80,5 +98,276 @@ async def test_pixelate_visualization_block() -> None:
     
     # dimensions of output match input
     assert output.get("image").numpy_image.shape == (1000, 1000, 3)
-    # check if the image is modified
-    assert not np.array_equal(output.get("image").numpy_image, start_image)
+    # check if the image is modified inside of one of the boxes
+    assert not np.array_equal(
+        output.get("image").numpy_image[80:120, 80:120], start_image[80:120, 80:120]
+    )
+
+
+@pytest.mark.asyncio
+async def test_pixelate_visualization_block_when_image_is_copied(
+    start_image_data: Tuple[np.ndarray, WorkflowImageData],
+) -> None:
+    # given
+    block = PixelateVisualizationBlock()
+    start_image, image = start_image_data
+    image_before_run = start_image.copy()
+
+    # when
+    output = await block.run(
+        image=image,
+        predictions=sv.Detections(
+            xyxy=np.array([[80, 80, 120, 120]], dtype=np.float64),
+        ),
+        copy_image=True,
+        pixel_size=10,
+    )
+
+    # then
+    assert not np.shares_memory(output["image"].numpy_image, start_image)
+    assert np.array_equal(start_image, image_before_run)
+
+
+def test_pixelate_annotator_fills_blocks_with_mean_color() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=2)
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    image[0, 0] = 40
+    image[3, 4:6] = 100
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(xyxy=np.array([[0, 0, 6, 4]], dtype=np.float64)),
+    )
+
+    # then
+    expected = np.zeros((4, 6, 3), dtype=np.uint8)
+    expected[0:2, 0:2] = 10
+    expected[2:4, 4:6] = 50
+    assert np.array_equal(result, expected)
+
+
+def test_pixelate_annotator_averages_partial_blocks_at_roi_border() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=4)
+    image = np.arange(5 * 5 * 3, dtype=np.uint8).reshape((5, 5, 3))
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(xyxy=np.array([[0, 0, 5, 5]], dtype=np.float64)),
+    )
+
+    # then
+    assert np.array_equal(result[4, 4], image[4, 4])
+    assert np.array_equal(
+        result[0:4, 0:4], np.broadcast_to(image[0:4, 0:4].mean(axis=(0, 1)), (4, 4, 3))
+    )
+
+
+def test_pixelate_annotator_skips_boxes_outside_of_image() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=2)
+    image = np.arange(4 * 4 * 3, dtype=np.uint8).reshape((4, 4, 3))
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(
+            xyxy=np.array([[10, 10, 20, 20], [2, 2, 2, 4]], dtype=np.float64)
+        ),
+    )
+
+    # then
+    assert np.array_equal(result, image)
+
+
+def test_pixelate_annotator_averages_partial_blocks_over_their_own_pixels() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=2)
+    image = np.zeros((3, 3, 3), dtype=np.uint8)
+    image[2, 0] = 10
+    image[2, 1] = 30
+    image[0:2, 2] = 100
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(xyxy=np.array([[0, 0, 3, 3]], dtype=np.float64)),
+    )
+
+    # then
+    expected = np.zeros((3, 3, 3), dtype=np.uint8)
+    expected[2, 0:2] = 20
+    expected[0:2, 2] = 100
+    assert np.array_equal(result, expected)
+
+
+def test_pixelate_annotator_in_parallel_matches_sequential_pixelation() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=4)
+    image = np.random.default_rng(0).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    detections = sv.Detections(
+        xyxy=np.array([[0, 0, 30, 30], [32, 0, 64, 30], [0, 32, 64, 63]], dtype=np.float64)
+    )
+    expected = annotator.annotate(scene=image.copy(), detections=detections)
+
+    # when
+    with mock.patch.object(
+        pixelate_annotator_module, "PIXELATION_WORKERS_NUMBER", 4
+    ), mock.patch.object(
+        pixelate_annotator_module, "PARALLEL_PIXELATION_MIN_PIXELS", 0
+    ), mock.patch.object(
+        pixelate_annotator_module,
+        "_PIXELATION_EXECUTOR",
+        wraps=pixelate_annotator_module._PIXELATION_EXECUTOR,
+    ) as executor_mock:
+        result = annotator.annotate(scene=image.copy(), detections=detections)
+
+    # then
+    executor_mock.map.assert_called_once()
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "xyxy, expected_result",
+    [
+        ([[0, 0, 10, 10], [10, 0, 20, 10]], True),
+        ([[0, 0, 10, 10], [9, 9, 20, 20]], False),
+        ([[0, 0, 10, 10]], False),
+        ([[i * 10, 0, i * 10 + 10, 10] for i in range(65)], False),
+    ],
+)
+def test_should_pixelate_in_parallel(xyxy: list, expected_result: bool) -> None:
+    # when
+    with mock.patch.object(
+        pixelate_annotator_module, "PIXELATION_WORKERS_NUMBER", 4
+    ), mock.patch.object(
+        pixelate_annotator_module, "PARALLEL_PIXELATION_MIN_PIXELS", 0
+    ):
+        result = pixelate_annotator_module._should_pixelate_in_parallel(
+            xyxy=np.array(xyxy, dtype=np.int32)
+        )
+
+    # then
+    assert result is expected_result
+
+
+def test_get_scratch_buffer_reuses_buffer_of_the_thread() -> None:
+    # when
+    first_buffer = pixelate_annotator_module._get_scratch_buffer(
+        shape=(8, 8, 3), dtype=np.float64
+    )
+    second_buffer = pixelate_annotator_module._get_scratch_buffer(
+        shape=(4, 5, 3), dtype=np.int32
+    )
+
+    # then
+    assert second_buffer.shape == (4, 5, 3)
+    assert second_buffer.dtype == np.int32
+    assert np.shares_memory(first_buffer, second_buffer)
+
+
+def test_get_scratch_buffer_does_not_retain_too_large_buffer() -> None:
+    # given
+    retained_buffer = pixelate_annotator_module._get_scratch_buffer(
+        shape=(2, 2, 3), dtype=np.int32
+    )
+
+    # when
+    with mock.patch.object(pixelate_annotator_module, "SCRATCH_BUFFER_MAX_BYTES", 48):
+        buffer = pixelate_annotator_module._get_scratch_buffer(
+            shape=(4, 4, 3), dtype=np.int32
+        )
+
+    # then
+    assert buffer.shape == (4, 4, 3)
+    assert not np.shares_memory(buffer, retained_buffer)
+    assert np.shares_memory(
+        pixelate_annotator_module._get_scratch_buffer(shape=(2, 2, 3), dtype=np.int32),
+        retained_buffer,
+    )
+
+
+def test_pixelate_annotator_uses_float64_sums_for_large_roi() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=4)
+    image = np.full((10, 10, 3), 255, dtype=np.uint8)
+
+    # when
+    with mock.patch.object(pixelate_annotator_module, "INT32_SUMS_MAX_PIXELS", 10):
+        result = annotator.annotate(
+            scene=image.copy(),
+            detections=sv.Detections(xyxy=np.array([[0, 0, 10, 10]], dtype=np.float64)),
+        )
+
+    # then
+    assert np.array_equal(result, image)
+
+
+@pytest.mark.parametrize("pixel_size", [0, 1])
+def test_pixelate_annotator_when_pixel_size_does_not_merge_pixels(
+    pixel_size: int,
+) -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=pixel_size)
+    image = np.arange(4 * 4 * 3, dtype=np.uint8).reshape((4, 4, 3))
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(xyxy=np.array([[0, 0, 4, 4]], dtype=np.float64)),
+    )
+
+    # then
+    assert np.array_equal(result, image)
+
+
+def test_pixelate_annotator_when_roi_is_smaller_than_pixel_size() -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=10)
+    image = np.zeros((6, 6, 3), dtype=np.uint8)
+    image[1, 1] = [30, 60, 90]
+    image[1, 2] = [0, 0, 1]
+
+    # when
+    result = annotator.annotate(
+        scene=image.copy(),
+        detections=sv.Detections(xyxy=np.array([[1, 1, 3, 2]], dtype=np.float64)),
+    )
+
+    # then
+    expected = image.copy()
+    expected[1, 1:3] = [15, 30, 46]
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "make_view",
+    [
+        lambda image: image[..., ::-1],
+        lambda image: image[::-1],
+        lambda image: image[:, ::2],
+        lambda image: image[..., 0],
+    ],
+    ids=["reversed_channels", "reversed_rows", "strided_columns", "channel_slice"],
+)
+def test_pixelate_annotator_when_scene_is_non_contiguous_view(make_view) -> None:
+    # given
+    annotator = PixelateAnnotator(pixel_size=4)
+    image = np.random.default_rng(0).integers(0, 255, (32, 64, 3), dtype=np.uint8)
+    scene = make_view(image)
+    detections = sv.Detections(
+        xyxy=np.array([[0, 0, 16, 16], [17, 3, 30, 29]], dtype=np.float64)
+    )
+    expected = annotator.annotate(
+        scene=np.ascontiguousarray(scene), detections=detections
+    )
+
+    # when
+    result = annotator.annotate(scene=scene, detections=detections)
+
+    # then
+    assert np.shares_memory(result, image)
+    assert np.array_equal(result, expected)